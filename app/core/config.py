@@ -1,20 +1,65 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import secrets
+from typing import Optional
 from pathlib import Path
 
 class Settings(BaseSettings):
     """Application settings."""
     # Base
     PROJECT_NAME: str = "Calorie Tracker"
+    METRICS_ENABLED: bool = True  # Per-route timings served at /metrics
+    MEAL_TRACKER_MEAL_LIMIT: int = 50  # Meals listed under the month calendar
+    MEAL_IMPORT_BATCH_SIZE: int = 500  # Meals written per transaction by the bulk import
+    MEAL_IMPORT_MAX_ERRORS: int = 100  # Row errors listed in an import report
+    EXPORT_BATCH_SIZE: int = 500  # Logs read per query by the history export
+    API_PAGE_SIZE: int = 50  # Default page size for paginated API listings
+    API_MAX_PAGE_SIZE: int = 200
+    COMMENTS_PAGE_SIZE: int = 20  # Comments shown per page of a knowledge base article
+    COMMENT_LIKES_BUFFERED: bool = False  # Coalesce likes in memory and write them in periodic batches
+    COMMENT_LIKES_FLUSH_SECONDS: float = 2.0
+    FOOD_CATALOG_RELOAD_SECONDS: float = 30.0  # How often search checks the catalog for changes
+    NUTRITION_GOAL_TOLERANCE: float = 0.1  # Days within this fraction of a goal count as on target
     
     # Authentication
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
     ALGORITHM: str = "HS256"
-    
+    IDENTITY_CACHE_MAXSIZE: int = 1024
+    IDENTITY_CACHE_TTL_SECONDS: float = 60.0
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32  # Hash calls allowed to wait before answering 503
+    RENDER_CACHE_MAXSIZE: int = 128  # Rendered knowledge base pages kept in memory
+    TEMPLATE_PRECOMPILE: bool = True  # Compile every template at startup instead of on first hit
+    TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = ".jinja_cache"  # Compiled templates shared by all workers; None to disable
+
     # Database
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///./sql_app.db"
-    DB_ECHO_LOG: bool = True
+    DB_ECHO_LOG: bool = False  # Raw SQLAlchemy echo; prefer the sampled SQL log below
+    DB_SQL_LOG_SAMPLE_RATE: float = 0.0  # Fraction of statements written to the "app.sql" logger
+    DB_SQL_LOG_SLOW_MS: Optional[float] = None  # Statements at least this slow are always logged
+    # Development aid: flag statements repeated within one request (likely N+1 lazy loads)
+    DB_N_PLUS_ONE_DETECTION: bool = False
+    DB_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Connection pool; "auto" picks StaticPool for in-memory SQLite, QueuePool otherwise
+    DB_POOL_CLASS: str = "auto"  # auto, queue, static or null
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced, -1 to disable
+    DB_POOL_PRE_PING: bool = True
+    DB_ASYNC_MODE: bool = False  # Serve meal/exercise/knowledge routes on an async engine
+    ASYNC_SQLALCHEMY_DATABASE_URI: Optional[str] = None  # Derived from SQLALCHEMY_DATABASE_URI when unset
+
+    # SQLite performance profile, applied to every new connection
+    SQLITE_TUNING_ENABLED: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE_KB: int = 64000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # in bytes
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_FOREIGN_KEYS: bool = False  # Enforcing changes delete behaviour; check for orphan rows first
 
     # First superuser
     FIRST_SUPERUSER_EMAIL: str = "admin@example.com"
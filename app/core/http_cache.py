@@ -0,0 +1,114 @@
+"""Conditional GET support and a cache of rendered pages.
+
+Pages whose content changes rarely compute a cheap validator (an ETag,
+plus a Last-Modified time where a timestamp tracks every change) from a
+summary query. A request carrying a
+matching `If-None-Match` (or, without one, an `If-Modified-Since` no
+older than the content) is answered 304 before anything is loaded or
+rendered. Otherwise the HTML rendered for that validator is kept in a
+bounded LRU, so repeat views of a popular page skip Jinja2 as well.
+Entries never need invalidating: a change produces a new validator and
+therefore a new key, and stale entries age out. Validators include the
+template sources too, so a deploy that changes the markup is not answered
+from a client's (or this cache's) copy of the old one.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from typing import Dict, Hashable, Optional, Tuple
+
+import jinja2
+from starlette.requests import Request
+
+from app.core.config import settings
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the validator parts."""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+@lru_cache(maxsize=None)
+def template_version(env: jinja2.Environment, *names: str) -> Tuple[str, datetime]:
+    """Digest and newest modification time (naive UTC) of the named templates' sources."""
+    digest = hashlib.sha1()
+    modified = []
+    for name in names:
+        source, filename, _ = env.loader.get_source(env, name)
+        digest.update(source.encode())
+        modified.append(os.path.getmtime(filename))
+    return digest.hexdigest()[:12], datetime.fromtimestamp(max(modified), timezone.utc).replace(tzinfo=None)
+
+def cache_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    """Validator headers; `private, no-cache` so browsers revalidate every view."""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Whether the client's cached copy is current (If-None-Match wins over If-Modified-Since)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison: W/"x" matches "x"
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole-second precision
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+
+class RenderCache:
+    """Bounded LRU of rendered response bodies."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached body for `key`, or None on a miss."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def set(self, key: Hashable, body: bytes) -> None:
+        """Store a body, evicting the least recently used entries past `maxsize`."""
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+render_cache = RenderCache(maxsize=settings.RENDER_CACHE_MAXSIZE)
@@ -0,0 +1,112 @@
+"""In-process cache of authenticated identities keyed by session token."""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Lightweight, session-independent view of an authenticated user."""
+    id: int
+    email: str
+    username: str
+    full_name: Optional[str] = None
+    is_active: bool = True
+    is_superuser: bool = False
+    is_verified: bool = False
+
+    @classmethod
+    def from_user(cls, user) -> "UserSnapshot":
+        """Build a snapshot from a `User` ORM instance."""
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            full_name=user.full_name,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+            is_verified=bool(user.is_verified)
+        )
+
+
+class IdentityCache:
+    """
+    Bounded LRU cache mapping session tokens to user snapshots.
+
+    Entries expire after `ttl` seconds so that changes made by other workers
+    are picked up eventually; changes made in this process invalidate the
+    affected entries immediately.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, UserSnapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        """Return the cached snapshot for `token`, or None on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, token: str, snapshot: UserSnapshot) -> None:
+        """Cache `snapshot` for `token`, evicting the least recently used entry."""
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[token] = (expires_at, snapshot)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_token(self, token: str) -> None:
+        """Drop a single token, e.g. on logout."""
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every token belonging to `user_id`."""
+        with self._lock:
+            stale = [token for token, (_, snapshot) in self._entries.items() if snapshot.id == user_id]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl
+            }
+
+
+identity_cache = IdentityCache(
+    maxsize=settings.IDENTITY_CACHE_MAXSIZE,
+    ttl=settings.IDENTITY_CACHE_TTL_SECONDS
+)
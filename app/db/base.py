@@ -1,11 +1,16 @@
 """Import all models and setup Base."""
 from app.db.base_class import Base  # noqa
 from app.models.user import User, UserProfile  # noqa
-from app.models.knowledge import KnowledgeCategory, Comment  # noqa
+from app.models.knowledge import KnowledgeCategory, Comment, CommentLike  # noqa
 from app.models.exercise import ExerciseLog, ExerciseComponent  # noqa
+from app.models.meal import MealLog, MealComponent, FavoriteMeal, FavoriteMealComponent  # noqa
+from app.models.nutrition import DailyNutritionSummary  # noqa
+from app.models.food import FoodItem  # noqa
 from app.core.enums import Gender, FitnessGoal, TimePreference, ExerciseType, PreferredSport  # noqa
 
 # Import all models here for Alembic autogeneration
-__all__ = ["Base", "User", "UserProfile", "KnowledgeCategory", "Comment", 
+__all__ = ["Base", "User", "UserProfile", "KnowledgeCategory", "Comment", "CommentLike", 
            "Gender", "FitnessGoal", "TimePreference", "ExerciseType", "PreferredSport",
-           "ExerciseLog", "ExerciseComponent"]
+           "ExerciseLog", "ExerciseComponent",
+           "MealLog", "MealComponent", "FavoriteMeal", "FavoriteMealComponent",
+           "DailyNutritionSummary", "FoodItem"]
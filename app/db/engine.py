@@ -0,0 +1,70 @@
+"""Engine factory shared by the sync and async sessions."""
+from typing import Any, Dict
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool, StaticPool
+
+from app.core.config import settings
+from app.db.sql_logging import install_sql_logging
+from app.db.sqlite import apply_sqlite_profile
+
+POOL_CLASSES = ("auto", "queue", "static", "null")
+
+
+def is_sqlite_memory(database_uri: str) -> bool:
+    """Whether `database_uri` points at an in-memory SQLite database."""
+    url = make_url(database_uri)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def resolve_pool_class(database_uri: str) -> str:
+    """Resolve `DB_POOL_CLASS` for the backend of `database_uri`."""
+    pool_class = settings.DB_POOL_CLASS.lower()
+    if pool_class not in POOL_CLASSES:
+        raise ValueError(f"DB_POOL_CLASS must be one of {', '.join(POOL_CLASSES)}, got {settings.DB_POOL_CLASS!r}")
+    if pool_class == "auto":
+        # Every connection to :memory: is a separate database, so share one
+        return "static" if is_sqlite_memory(database_uri) else "queue"
+    return pool_class
+
+def engine_options(database_uri: str, is_async: bool = False) -> Dict[str, Any]:
+    """Build the `create_engine` keyword arguments for `database_uri`."""
+    options: Dict[str, Any] = {
+        "echo": settings.DB_ECHO_LOG,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    pool_class = resolve_pool_class(database_uri)
+    if pool_class == "queue":
+        options.update(
+            poolclass=AsyncAdaptedQueuePool if is_async else QueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    elif pool_class == "static":
+        options["poolclass"] = StaticPool
+    else:
+        options["poolclass"] = NullPool
+
+    if make_url(database_uri).get_backend_name() == "sqlite":
+        # Pooled connections move between threads (and the async driver's worker)
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+def _configure(engine: Engine) -> None:
+    apply_sqlite_profile(engine)
+    install_sql_logging(engine)
+
+def create_db_engine(database_uri: str, **overrides: Any) -> Engine:
+    """Create a sync engine configured from settings."""
+    engine = create_engine(database_uri, **{**engine_options(database_uri), **overrides})
+    _configure(engine)
+    return engine
+
+def create_async_db_engine(database_uri: str, **overrides: Any) -> AsyncEngine:
+    """Create an async engine configured from settings."""
+    engine = create_async_engine(database_uri, **{**engine_options(database_uri, is_async=True), **overrides})
+    _configure(engine.sync_engine)
+    return engine
@@ -0,0 +1,88 @@
+"""Per-request database usage tracking."""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+
+@dataclass
+class RequestDBStats:
+    """Database usage accumulated while serving a single request."""
+    checkouts: int = 0
+    queries: int = 0
+    db_time: float = 0.0  # seconds spent in cursor execution
+    track_statements: bool = False
+    statements: Counter = field(default_factory=Counter)
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times, most frequent first."""
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+_request_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestDBStats]:
+    """Return the stats object for the request being served, if any."""
+    return _request_stats.get()
+
+
+@contextmanager
+def track_request_db(track_statements: bool = False) -> Iterator[RequestDBStats]:
+    """
+    Collect database usage for everything executed inside the block.
+
+    With `track_statements`, each distinct SQL string is counted too. Bound
+    parameters are not part of the string, so a statement repeated with
+    different parameters (a lazy load per row) shows up as one high count.
+    """
+    stats = RequestDBStats(track_statements=track_statements)
+    reset_token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(reset_token)
+
+
+@event.listens_for(Pool, "checkout")
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.checkouts += 1
+
+
+# Start times live on the execution context, so a statement that raises
+# leaves nothing behind on the (pooled) connection
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query(conn, cursor, statement, parameters, context, executemany):
+    if _request_stats.get() is not None and context is not None:
+        context._request_query_started = time.perf_counter()
+
+
+def _record_query(context, statement: str) -> None:
+    stats = _request_stats.get()
+    started = getattr(context, "_request_query_started", None)
+    if stats is None or started is None:
+        return
+    context._request_query_started = None
+    stats.queries += 1
+    stats.db_time += time.perf_counter() - started
+    if stats.track_statements:
+        stats.statements[statement] += 1
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    _record_query(context, statement)
+
+
+@event.listens_for(Engine, "handle_error")
+def _count_failed_query(exception_context):
+    # Failing statements never reach after_cursor_execute but still cost a round trip
+    _record_query(exception_context.execution_context, exception_context.statement)
@@ -1,12 +1,15 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional, TypeVar, Union
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.db.engine import create_async_db_engine, create_db_engine
+
+T = TypeVar("T")
 
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    pool_pre_ping=True,
-    echo=settings.DB_ECHO_LOG
-)
+engine = create_db_engine(settings.SQLALCHEMY_DATABASE_URI)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -17,3 +20,80 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Async engine, created on first use so the async driver is only needed when enabled
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+def get_async_database_uri() -> str:
+    """Return the async-driver URI matching the configured database."""
+    if settings.ASYNC_SQLALCHEMY_DATABASE_URI:
+        return settings.ASYNC_SQLALCHEMY_DATABASE_URI
+    uri = settings.SQLALCHEMY_DATABASE_URI
+    if uri.startswith("sqlite://"):
+        return uri.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if uri.startswith("postgresql://"):
+        return uri.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return uri
+
+def get_async_engine() -> AsyncEngine:
+    """Return the shared async engine, creating it if needed."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        _async_engine = create_async_db_engine(get_async_database_uri())
+        # Objects must stay readable after commit without an implicit (blocking) refresh
+        _AsyncSessionLocal = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+async def get_async_db():
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+# Session dependency for routes that support both modes
+get_route_db = get_async_db if settings.DB_ASYNC_MODE else get_db
+
+@asynccontextmanager
+async def open_route_db() -> AsyncIterator[Union[Session, AsyncSession]]:
+    """
+    Open a session in the configured mode outside of dependency injection.
+
+    For work that outlives the handler, such as a streamed response body:
+    the request's own session may already be closed by then.
+    """
+    if settings.DB_ASYNC_MODE:
+        get_async_engine()
+        async with _AsyncSessionLocal() as db:
+            yield db
+        return
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def run_db(db: Union[Session, AsyncSession], fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run `fn(session, *args, **kwargs)` against a sync or async session.
+
+    With an `AsyncSession` the function runs through `run_sync`, so every
+    statement it issues (including lazy loads) awaits the async driver
+    instead of blocking the event loop.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return fn(db, *args, **kwargs)
+
+async def run_db_offloaded(db: Union[Session, AsyncSession], fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Like `run_db`, but a sync session's work runs in the threadpool.
+
+    For long jobs (bulk imports) that would otherwise hold the event loop
+    for their whole duration in sync mode. The session is only used by
+    that thread until the call returns.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
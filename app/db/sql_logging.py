@@ -0,0 +1,53 @@
+"""Structured, sampled SQL statement logging."""
+import json
+import logging
+import random
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+
+# Statements longer than this are truncated in log records
+MAX_STATEMENT_LENGTH = 500
+
+
+def should_log(duration_ms: float) -> bool:
+    """Decide whether a statement that took `duration_ms` gets logged."""
+    slow_ms = settings.DB_SQL_LOG_SLOW_MS
+    if slow_ms is not None and duration_ms >= slow_ms:
+        return True
+    rate = settings.DB_SQL_LOG_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+def install_sql_logging(engine: Engine) -> None:
+    """Emit one JSON record per sampled (or slow) statement run on `engine`."""
+    if settings.DB_SQL_LOG_SAMPLE_RATE <= 0 and settings.DB_SQL_LOG_SLOW_MS is None:
+        return
+
+    # The start time lives on the execution context, so a statement that
+    # raises (and never reaches after_cursor_execute) leaves nothing behind
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._sql_log_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_statement(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_sql_log_started", None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if not should_log(duration_ms):
+            return
+        logger.info(json.dumps({
+            "event": "sql",
+            "duration_ms": round(duration_ms, 3),
+            "statement": " ".join(statement.split())[:MAX_STATEMENT_LENGTH],
+            "executemany": executemany,
+            "rowcount": cursor.rowcount,
+            "slow": settings.DB_SQL_LOG_SLOW_MS is not None and duration_ms >= settings.DB_SQL_LOG_SLOW_MS,
+        }))
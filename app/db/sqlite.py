@@ -0,0 +1,38 @@
+"""SQLite connection tuning."""
+from typing import List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+
+def sqlite_pragmas() -> List[Tuple[str, str]]:
+    """Return the configured PRAGMAs in the order they are applied."""
+    return [
+        # busy_timeout first so the journal mode switch waits out other writers
+        ("busy_timeout", str(settings.SQLITE_BUSY_TIMEOUT_MS)),
+        ("journal_mode", settings.SQLITE_JOURNAL_MODE),
+        ("synchronous", settings.SQLITE_SYNCHRONOUS),
+        # Negative values are in KiB rather than pages
+        ("cache_size", str(-settings.SQLITE_CACHE_SIZE_KB)),
+        ("mmap_size", str(settings.SQLITE_MMAP_SIZE)),
+        ("temp_store", settings.SQLITE_TEMP_STORE),
+        ("foreign_keys", "ON" if settings.SQLITE_FOREIGN_KEYS else "OFF"),
+    ]
+
+def apply_sqlite_profile(engine: Engine) -> None:
+    """Apply the SQLite performance profile to each connection `engine` opens."""
+    if engine.dialect.name != "sqlite" or not settings.SQLITE_TUNING_ENABLED:
+        return
+
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
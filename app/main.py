@@ -5,40 +5,63 @@ from fastapi import (
     status, 
     Form, 
     Request,
-    Response
+    Response,
+    Query,
+    File,
+    UploadFile
 )
 from fastapi.responses import HTMLResponse  # Add this import
-from starlette.responses import RedirectResponse, JSONResponse
+from starlette.responses import RedirectResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from pathlib import Path
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict
+from contextlib import asynccontextmanager
 from functools import wraps
+import asyncio
+import jinja2
+import inspect
+import logging
 import secrets
+import time
 from datetime import datetime, timedelta
 from calendar import monthcalendar
-from sqlalchemy.orm import selectinload
-from sqlalchemy import extract
-from .models.meal import MealLog, MealComponent, FavoriteMeal, FavoriteMealComponent, MealType, FoodCategory, UnitType
+from .models.meal import MealType, FoodCategory, UnitType
 
 from app.core.config import settings
-from app.core.security import verify_password, get_password_hash, create_access_token, get_current_user_from_token
+from app.core.security import (
+    verify_password_async, get_password_hash_async, create_access_token, get_current_user_from_token,
+    password_hash_pool
+)
 from app.core.password_validation import password_validator
+from app.core.identity_cache import identity_cache, UserSnapshot
+from app.core import metrics, http_cache
 from app.core.enums import (
     Gender, FitnessGoal, TimePreference, ExerciseType, PreferredSport,
     MedicalCondition, CommonMedication, CommonAllergy, PastInjury, ExerciseIntensity
 )
-from app.db.session import get_db
-from app.db.base import User, UserProfile, ExerciseLog, ExerciseComponent
-from app.models.knowledge import KnowledgeCategory, Comment
+from app.db.session import engine, SessionLocal, get_db, get_route_db, open_route_db, run_db, run_db_offloaded
+from app.db.instrumentation import track_request_db
+from app.db.base import User, UserProfile
+from app.models.exercise import (
+    ExerciseType as ExerciseLogType, ExerciseIntensity as ExerciseLogIntensity, ExerciseCategory
+)
 from app.schemas.survey import (
     SurveyCreate, HealthConditionSchema, MedicationSchema,
     AllergySchema, InjurySchema
 )
 from app.schemas.knowledge import KnowledgeCategoryCreate, CommentCreate
+from app.services import meals as meal_service
+from app.services import exercises as exercise_service
+from app.services import knowledge as knowledge_service
+from app.services import nutrition as nutrition_service
+from app.services import meal_import
+from app.services import export as export_service
+from app.services import foods as food_service
+from app.services import analytics as analytics_service
+from app.services import targets as target_service
+from app.services import energy_balance as energy_balance_service
 from pydantic import ValidationError
-from .models.meal import MealLog, MealComponent, FavoriteMeal, FavoriteMealComponent, MealType, FoodCategory, UnitType
 from json.decoder import JSONDecodeError
 
 """
@@ -60,15 +83,59 @@ The application is divided into the following modules:
 * `app.schemas`: Pydantic models for API endpoints.
 * `app.routes`: API endpoints and route handlers.
 """
+def _flush_buffered_likes() -> int:
+    db = SessionLocal()
+    try:
+        return knowledge_service.like_buffer.flush(db)
+    finally:
+        db.close()
+
+async def _flush_likes_periodically():
+    while True:
+        await asyncio.sleep(settings.COMMENT_LIKES_FLUSH_SECONDS)
+        try:
+            await asyncio.to_thread(_flush_buffered_likes)
+        except Exception:
+            logger.exception("Flushing buffered comment likes failed")
+
+def _precompile_templates() -> None:
+    report = templates.precompile()
+    slowest = sorted(report.items(), key=lambda item: item[1], reverse=True)
+    logger.info(
+        "Precompiled %d templates in %.1f ms: %s",
+        len(report), sum(report.values()) * 1000,
+        ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in slowest),
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Precompile templates, run the like flusher while serving, and write what it holds on shutdown."""
+    if settings.TEMPLATE_PRECOMPILE:
+        _precompile_templates()
+    flusher = asyncio.create_task(_flush_likes_periodically()) if settings.COMMENT_LIKES_BUFFERED else None
+    yield
+    if flusher is not None:
+        flusher.cancel()
+        await asyncio.to_thread(_flush_buffered_likes)
+
 app = FastAPI(
-    title=settings.PROJECT_NAME
+    title=settings.PROJECT_NAME,
+    lifespan=lifespan
 )
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Templates
-templates = Jinja2Templates(directory="templates")
+def _bytecode_cache() -> Optional[jinja2.BytecodeCache]:
+    """Filesystem cache of compiled templates, shared by every worker process."""
+    if not settings.TEMPLATE_BYTECODE_CACHE_DIR:
+        return None
+    directory = Path(settings.TEMPLATE_BYTECODE_CACHE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    return jinja2.FileSystemBytecodeCache(str(directory))
+
+templates = metrics.TimedJinja2Templates(directory="templates", bytecode_cache=_bytecode_cache())
 
 # Add custom Jinja2 filters
 def month_name(month_number):
@@ -95,25 +162,134 @@ templates.env.filters["month_name"] = month_name
 templates.env.filters["dateformat"] = dateformat
 templates.env.filters["timeformat"] = timeformat
 
+logger = logging.getLogger(__name__)
+
 # Base directory
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+@app.middleware("http")
+async def track_db_usage(request: Request, call_next):
+    """Report the connections, queries and DB time each request used."""
+    with track_request_db(track_statements=settings.DB_N_PLUS_ONE_DETECTION) as db_stats:
+        response = await call_next(request)
+    response.headers["X-DB-Checkouts"] = str(db_stats.checkouts)
+    response.headers["X-DB-Query-Count"] = str(db_stats.queries)
+    response.headers["X-DB-Time-ms"] = f"{db_stats.db_time * 1000:.2f}"
+
+    if settings.DB_N_PLUS_ONE_DETECTION:
+        repeated = db_stats.repeated_statements(settings.DB_N_PLUS_ONE_THRESHOLD)
+        response.headers["X-DB-N-Plus-One"] = str(len(repeated))
+        for statement, count in repeated:
+            logger.warning(
+                "Possible N+1 on %s %s: statement ran %d times: %s",
+                request.method, request.url.path, count, " ".join(statement.split())
+            )
+    return response
+
+def _route_label(request: Request) -> str:
+    """Label a request by its route template so path parameters don't explode cardinality."""
+    route = request.scope.get("route")
+    if route is not None:
+        return route.path
+    # Mounted apps (static files) only leave their prefix behind
+    if request.scope.get("root_path"):
+        return request.scope["root_path"] + "/{path}"
+    return "<unmatched>"
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record latency, status and template render time per route."""
+    if not settings.METRICS_ENABLED:
+        return await call_next(request)
+
+    method = request.method
+    metrics.http_requests_in_progress.inc(method=method)
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        with metrics.track_request_timing() as timing:
+            response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        route = _route_label(request)
+        metrics.http_requests_in_progress.dec(method=method)
+        metrics.http_requests_total.inc(method=method, route=route, status=str(status_code))
+        metrics.http_request_duration_seconds.observe(elapsed, method=method, route=route)
+        metrics.http_request_phase_seconds.observe(timing.template_seconds, route=route, phase="template")
+        metrics.http_request_phase_seconds.observe(
+            max(elapsed - timing.template_seconds, 0.0), route=route, phase="handler"
+        )
+
+identity_cache_gauge = metrics.registry.register(metrics.Gauge(
+    "identity_cache", "Identity cache counters and occupancy.", ("stat",)
+))
+password_hash_pool_gauge = metrics.registry.register(metrics.Gauge(
+    "password_hash_pool", "Password hashing pool counters and queue depth.", ("stat",)
+))
+db_pool_gauge = metrics.registry.register(metrics.Gauge(
+    "db_pool_connections", "Connections held by the sync engine's pool.", ("state",)
+))
+render_cache_gauge = metrics.registry.register(metrics.Gauge(
+    "render_cache", "Rendered page cache counters and occupancy.", ("stat",)
+))
+
+def _collect_runtime_stats():
+    for stat, value in identity_cache.stats().items():
+        identity_cache_gauge.set(value, stat=stat)
+    for stat, value in password_hash_pool.stats().items():
+        password_hash_pool_gauge.set(value, stat=stat)
+    for stat, value in http_cache.render_cache.stats().items():
+        render_cache_gauge.set(value, stat=stat)
+    # Only QueuePool tracks these; StaticPool and NullPool have nothing to report
+    for state, method in (("checked_out", "checkedout"), ("idle", "checkedin"), ("overflow", "overflow")):
+        if hasattr(engine.pool, method):
+            db_pool_gauge.set(getattr(engine.pool, method)(), state=state)
+
+metrics.registry.add_collector(_collect_runtime_stats)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+def _load_user_snapshot(db: Session, email: str) -> Optional[UserSnapshot]:
+    """Look up a user by email and detach it as a snapshot."""
+    user = db.query(User).filter(User.email == email).first()
+    return UserSnapshot.from_user(user) if user else None
+
 def login_required(func):
+    """
+    Require an authenticated user and expose it as `request.state.user`.
+
+    The decorated route must declare a `db` session dependency (`get_db`
+    or `get_route_db`); the user lookup runs on that same request-scoped
+    session so each request checks out a single connection.
+    """
+    if "db" not in inspect.signature(func).parameters:
+        raise TypeError(f"{func.__name__} must declare a 'db' dependency to use @login_required")
+
     @wraps(func)
     async def wrapper(request: Request, *args, **kwargs):
         token = request.cookies.get("access_token")
         if not token:
             return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
         
-        email = get_current_user_from_token(token)
-        if not email:
-            return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
-        
-        # Get user from database
-        db = next(get_db())
-        user = db.query(User).filter(User.email == email).first()
-        if not user:
-            return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
+        # Serve repeat hits from the identity cache without decoding or querying
+        user = identity_cache.get(token)
+        if user is None:
+            email = get_current_user_from_token(token)
+            if not email:
+                return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
+            
+            # Get user from database using the route's session
+            user = await run_db(kwargs["db"], _load_user_snapshot, email)
+            if not user or not user.is_active:
+                return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
+            
+            identity_cache.set(token, user)
         
         # Add user to request state
         request.state.user = user
@@ -136,7 +312,7 @@ async def login(
     db: Session = Depends(get_db)
 ):
     user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password_async(password, user.hashed_password):
         return templates.TemplateResponse(
             "login.html",
             {"request": request, "error": "Incorrect email or password"},
@@ -206,7 +382,7 @@ async def register(
         )
     
     # Create new user
-    hashed_password = get_password_hash(password)
+    hashed_password = await get_password_hash_async(password)
     user = User(
         email=email,
         username=username,
@@ -238,15 +414,17 @@ async def dashboard(
     request: Request,
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(User.email == request.state.user.email).first()
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
-        "user": user
+        "user": request.state.user
     })
 
 @app.get("/logout")
 @app.post("/logout")
-async def logout():
+async def logout(request: Request):
+    token = request.cookies.get("access_token")
+    if token:
+        identity_cache.invalidate_token(token)
     response = RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
     response.delete_cookie("access_token")
     return response
@@ -335,12 +513,16 @@ async def reset_password(
             {"request": request, "token": token, "error": errors[0]}
         )
     
+    # Hash before the try block so a saturated pool surfaces as a 503
+    hashed_password = await get_password_hash_async(password)
+    
     try:
         # Update password and clear reset token
-        user.hashed_password = get_password_hash(password)
+        user.hashed_password = hashed_password
         user.reset_token = None
         user.reset_token_expires = None
         db.commit()
+        identity_cache.invalidate_user(user.id)
         
         return RedirectResponse(
             url="/login",
@@ -357,8 +539,7 @@ async def reset_password(
 @login_required
 async def survey_page(request: Request, db: Session = Depends(get_db)):
     # Get user profile
-    user_email = request.state.user.email
-    user = db.query(User).filter(User.email == user_email).first()
+    user = request.state.user
     profile = db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
     
     return templates.TemplateResponse(
@@ -389,10 +570,7 @@ async def submit_survey(
     """Handle survey form submission."""
     try:
         # Get current user
-        email = request.state.user.email
-        user = db.query(User).filter(User.email == email).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+        user = request.state.user
 
         # Create or update user profile
         profile = db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
@@ -452,11 +630,7 @@ async def submit_survey(
 @login_required
 async def profile_page(request: Request, db: Session = Depends(get_db)):
     """Display user profile page."""
-    email = request.state.user.email
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
+    user = request.state.user
     profile = db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
     if not profile:
         return RedirectResponse(url="/survey", status_code=status.HTTP_303_SEE_OTHER)
@@ -470,36 +644,80 @@ async def profile_page(request: Request, db: Session = Depends(get_db)):
         }
     )
 
+async def _cached_page(request: Request, etag: str, last_modified: Optional[datetime], render) -> Response:
+    """
+    Answer a page view from its validator: 304 if the client is current,
+    else the HTML cached for this validator, else `await render()` (cached).
+    Pass `last_modified=None` for pages whose changes no timestamp tracks.
+    """
+    headers = http_cache.cache_headers(etag, last_modified)
+    if http_cache.is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Rendered links are absolute, so the host is part of the key, as is the query (page cursors)
+    key = (str(request.url), etag)
+    body = http_cache.render_cache.get(key)
+    if body is None:
+        body = (await render()).body
+        http_cache.render_cache.set(key, body)
+    return HTMLResponse(body, headers=headers)
+
 @app.get("/knowledge-base")
 @login_required
-async def knowledge_base(request: Request, db: Session = Depends(get_db)):
+async def knowledge_base(request: Request, db: Session = Depends(get_route_db)):
     """Display knowledge base categories."""
-    categories = db.query(KnowledgeCategory).all()
-    return templates.TemplateResponse(
-        "knowledge_base.html",
-        {"request": request, "categories": categories}
-    )
+    user = request.state.user
+    version = await run_db(db, knowledge_service.categories_version)
+    markup, markup_modified = http_cache.template_version(templates.env, "base.html", "knowledge_base.html")
+    etag = http_cache.make_etag("knowledge-base", user.id, markup, *version)
+    last_modified = max(filter(None, (version[2], markup_modified)))
+
+    async def render():
+        categories = await run_db(db, knowledge_service.get_categories)
+        return templates.TemplateResponse(
+            "knowledge_base.html",
+            {"request": request, "categories": categories}
+        )
+    return await _cached_page(request, etag, last_modified, render)
 
 @app.get("/knowledge-base/{category_id}")
 @login_required
 async def view_category(
     request: Request,
     category_id: int,
-    db: Session = Depends(get_db)
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    db: Session = Depends(get_route_db)
 ):
-    """Display a specific knowledge category with its comments."""
-    category = db.query(KnowledgeCategory).filter(KnowledgeCategory.id == category_id).first()
-    if not category:
+    """Display a specific knowledge category with a page of its comments."""
+    user = request.state.user
+    version = await run_db(db, knowledge_service.category_version, category_id)
+    if not version:
         raise HTTPException(status_code=404, detail="Category not found")
-    
-    return templates.TemplateResponse(
-        "knowledge_category.html",
-        {
-            "request": request, 
-            "category": category,
-            "current_user": request.state.user
-        }
-    )
+    # The page differs per user (only your own comments get a delete button)
+    markup, _ = http_cache.template_version(templates.env, "base.html", "knowledge_category.html")
+    etag = http_cache.make_etag("knowledge-category", category_id, user.id, markup, *version)
+
+    async def render():
+        category = await run_db(db, knowledge_service.get_category, category_id)
+        try:
+            comments = await run_db(
+                db, knowledge_service.get_comment_page,
+                category_id, settings.COMMENTS_PAGE_SIZE, before, after
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return templates.TemplateResponse(
+            "knowledge_category.html",
+            {
+                "request": request, 
+                "category": category,
+                "comments": comments,
+                "current_user": user
+            }
+        )
+    # ETag only: comment deletions and likes change the page without moving any updated_at
+    return await _cached_page(request, etag, None, render)
 
 @app.post("/knowledge-base/{category_id}/comments")
 @login_required
@@ -507,49 +725,34 @@ async def add_comment(
     request: Request,
     category_id: int,
     comment_text: str = Form(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_route_db)
 ):
     user = request.state.user
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    comment = Comment(
-        category_id=category_id,
-        user_id=user.id,
-        content=comment_text,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
-    )
-    
     try:
-        db.add(comment)
-        db.commit()
-        db.refresh(comment)
+        await run_db(db, knowledge_service.add_comment, category_id, user.id, comment_text)
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
     
     return RedirectResponse(url=f"/knowledge-base/{category_id}", status_code=303)
 
 @app.post("/knowledge-base/comments/{comment_id}/like")
 @login_required
-async def like_comment(request: Request, comment_id: int, db: Session = Depends(get_db)):
+async def like_comment(request: Request, comment_id: int, db: Session = Depends(get_route_db)):
     """Like a comment."""
     user = request.state.user
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
-    if not comment:
+    category_id = await run_db(db, knowledge_service.like_comment, comment_id, user.id)
+    if category_id is None:
         raise HTTPException(status_code=404, detail="Comment not found")
 
-    # Increment likes
-    comment.likes = (comment.likes or 0) + 1
-    db.commit()
-
     # Return to the category page
     return RedirectResponse(
-        url=f"/knowledge-base/{comment.category_id}",
+        url=f"/knowledge-base/{category_id}",
         status_code=status.HTTP_303_SEE_OTHER
     )
 
@@ -558,20 +761,16 @@ async def like_comment(request: Request, comment_id: int, db: Session = Depends(
 async def delete_comment(
     request: Request,
     comment_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_route_db)
 ):
     """Delete a comment."""
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
-    if not comment:
+    try:
+        category_id = await run_db(db, knowledge_service.delete_comment, comment_id, request.state.user.id)
+    except knowledge_service.NotAuthorizedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    if category_id is None:
         raise HTTPException(status_code=404, detail="Comment not found")
     
-    if comment.user_id != request.state.user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this comment")
-    
-    category_id = comment.category_id
-    db.delete(comment)
-    db.commit()
-    
     return RedirectResponse(
         url=f"/knowledge-base/{category_id}",
         status_code=status.HTTP_303_SEE_OTHER
@@ -579,7 +778,7 @@ async def delete_comment(
 
 @app.get("/meal-tracker")
 @login_required
-async def meal_tracker_home(request: Request, db: Session = Depends(get_db)):
+async def meal_tracker_home(request: Request, db: Session = Depends(get_route_db)):
     """Meal tracker home page - redirects to current month."""
     today = datetime.now()
     return RedirectResponse(
@@ -589,7 +788,7 @@ async def meal_tracker_home(request: Request, db: Session = Depends(get_db)):
 
 @app.get("/meal-tracker/view/{date}")
 @login_required
-async def view_day(request: Request, date: str, db: Session = Depends(get_db)):
+async def view_day(request: Request, date: str, db: Session = Depends(get_route_db)):
     """Show detailed view of a specific day's meals."""
     user = request.state.user
     if not user:
@@ -598,23 +797,12 @@ async def view_day(request: Request, date: str, db: Session = Depends(get_db)):
     try:
         # Parse the date string to datetime in UTC
         view_date = datetime.strptime(f"{date} 00:00:00", '%Y-%m-%d %H:%M:%S')
-        next_day = datetime.strptime(f"{date} 23:59:59", '%Y-%m-%d %H:%M:%S')
+        next_day = view_date + timedelta(days=1)
         
         # Get all meals for the specified day
-        meals = (
-            db.query(MealLog)
-            .filter(
-                MealLog.user_id == user.id,
-                MealLog.date >= view_date,
-                MealLog.date <= next_day
-            )
-            .options(selectinload(MealLog.components))
-            .order_by(MealLog.date)
-            .all()
-        )
+        meals = await run_db(db, meal_service.get_meals_between, user.id, view_date, next_day)
         
-        # Calculate totals for each meal and the day
-        day_totals = {"calories": 0, "protein": 0, "carbs": 0, "fat": 0}
+        # Calculate totals for each meal
         meal_details = []
         
         for meal in meals:
@@ -626,12 +814,15 @@ async def view_day(request: Request, date: str, db: Session = Depends(get_db)):
                 "total_carbs": sum(c.carbs or 0 for c in meal.components),
                 "total_fat": sum(c.fat or 0 for c in meal.components)
             }
-            day_totals["calories"] += meal_totals["total_calories"]
-            day_totals["protein"] += meal_totals["total_protein"]
-            day_totals["carbs"] += meal_totals["total_carbs"]
-            day_totals["fat"] += meal_totals["total_fat"]
             meal_details.append(meal_totals)
         
+        # Day totals come from the rollup row
+        summary = await run_db(db, nutrition_service.get_day_summary, user.id, view_date.date())
+        day_totals = {
+            nutrient: getattr(summary, nutrient) if summary else 0
+            for nutrient in nutrition_service.NUTRIENTS
+        }
+        
         return {
             "meals": meal_details,
             "totals": day_totals
@@ -642,13 +833,90 @@ async def view_day(request: Request, date: str, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
+@app.get("/api/nutrition/summary")
+@login_required
+async def nutrition_summary(
+    request: Request,
+    start: str,
+    end: str,
+    db: Session = Depends(get_route_db)
+):
+    """Get daily nutrition totals and their sum for `start <= date < end`."""
+    user = request.state.user
+    try:
+        start_date = datetime.strptime(start, "%Y-%m-%d").date()
+        end_date = datetime.strptime(end, "%Y-%m-%d").date()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
+
+    days = await run_db(db, nutrition_service.get_summaries_between, user.id, start_date, end_date)
+    totals = await run_db(db, nutrition_service.get_period_totals, user.id, start_date, end_date)
+    return {"days": [day.to_dict() for day in days], "totals": totals}
+
+@app.get("/api/analytics/nutrition")
+@login_required
+async def nutrition_analytics(
+    request: Request,
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+    db: Session = Depends(get_route_db)
+):
+    """Get nutrition trends for an inclusive date range, the last 90 days by default."""
+    user = request.state.user
+    start, end = _parse_date_range(date_from, date_to)
+    end_date = end.date() if end else datetime.now().date() + timedelta(days=1)
+    start_date = start.date() if start else end_date - timedelta(days=90)
+    try:
+        return await run_db(db, analytics_service.nutrition_trends, user.id, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/energy-balance")
+@login_required
+async def energy_balance(
+    request: Request,
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+    db: Session = Depends(get_route_db)
+):
+    """Get daily intake, burn and net calories for an inclusive date range, the last 90 days by default."""
+    user = request.state.user
+    start, end = _parse_date_range(date_from, date_to)
+    end_date = end.date() if end else datetime.now().date() + timedelta(days=1)
+    start_date = start.date() if start else end_date - timedelta(days=90)
+    try:
+        return await run_db(db, energy_balance_service.get_energy_balance, user.id, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/nutrition/targets")
+@login_required
+async def nutrition_targets(
+    request: Request,
+    activity_level: str = target_service.DEFAULT_ACTIVITY_LEVEL,
+    db: Session = Depends(get_route_db)
+):
+    """Get recommended daily targets for the user's profile next to their current goals."""
+    user = request.state.user
+    try:
+        targets = await run_db(db, target_service.get_profile_targets, user.id, activity_level)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if targets is None:
+        raise HTTPException(status_code=404, detail="Complete the survey first")
+    return targets
+
+# Most meals the month view will list, however far "Show more" is followed
+MEAL_TRACKER_MAX_LIMIT = 500
+
 @app.get("/meal-tracker/{year}/{month}")
 @login_required
 async def meal_tracker(
     request: Request,
     year: int,
     month: int,
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=MEAL_TRACKER_MAX_LIMIT),
+    db: Session = Depends(get_route_db)
 ):
     """Meal tracker page."""
     user = request.state.user
@@ -676,20 +944,25 @@ async def meal_tracker(
     # Get start date for current month
     start_date = datetime(year, month, 1)
 
-    # Get meal logs for the specified month
-    meal_logs = db.query(MealLog)\
-        .filter(
-            MealLog.user_id == user.id,
-            MealLog.date >= start_date,
-            MealLog.date < end_date
-        )\
-        .order_by(MealLog.date.desc())\
-        .all()
+    # Per-day counts and calories for the calendar, from the daily rollup
+    day_summaries = await run_db(
+        db, nutrition_service.get_summaries_between, user.id, start_date.date(), end_date.date()
+    )
+    summaries_by_date = {summary.date: summary for summary in day_summaries}
+
+    # Most recent meals of the month for the list below the calendar
+    limit = limit or settings.MEAL_TRACKER_MEAL_LIMIT
+    meal_logs = await run_db(
+        db, meal_service.get_meals_between, user.id, start_date, end_date,
+        descending=True, limit=limit
+    )
+    # The rollup already counts the month's meals, so the cut can be shown without another query
+    month_meal_count = sum(summary.meal_count for summary in day_summaries)
+    more_limit = min(limit + settings.MEAL_TRACKER_MEAL_LIMIT, MEAL_TRACKER_MAX_LIMIT)
 
     # Generate calendar weeks
     cal = monthcalendar(year, month)
     calendar_weeks = []
-    meal_dates = {meal.date.date() for meal in meal_logs}
     
     for week in cal:
         calendar_week = []
@@ -698,9 +971,12 @@ async def meal_tracker(
                 calendar_week.append({"date": None})
             else:
                 current_date = datetime(year, month, day).date()
+                summary = summaries_by_date.get(current_date)
                 calendar_week.append({
                     "date": current_date,
-                    "has_meals": current_date in meal_dates
+                    "has_meals": summary is not None,
+                    "meal_count": summary.meal_count if summary else 0,
+                    "calories": summary.calories if summary else 0
                 })
         calendar_weeks.append(calendar_week)
 
@@ -719,7 +995,9 @@ async def meal_tracker(
             "prev_month": prev_month,
             "next_month": next_month,
             "current_user": user,
-            "calendar_weeks": calendar_weeks
+            "calendar_weeks": calendar_weeks,
+            "month_meal_count": month_meal_count,
+            "more_limit": more_limit if more_limit > limit else None
         }
     )
 
@@ -727,7 +1005,7 @@ async def meal_tracker(
 @login_required
 async def add_meal(
     request: Request,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_route_db)
 ):
     """Add a new meal log."""
     user = request.state.user
@@ -755,15 +1033,8 @@ async def add_meal(
         # Parse the date and time
         meal_datetime = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
         
-        # Create new meal log with proper enum value
-        new_meal = MealLog(
-            user_id=user.id,
-            date=meal_datetime,
-            meal_type=MealType(meal_type.lower()),  # Convert string to enum
-            notes=notes
-        )
-        db.add(new_meal)
-        db.flush()  # This assigns the ID to new_meal without committing the transaction
+        # Convert string to enum
+        meal_type = MealType(meal_type.lower())
         
         # Get components
         try:
@@ -798,29 +1069,32 @@ async def add_meal(
                             'fat': fat
                         })
         
-        # Add meal components
-        for component_data in components:
-            component = MealComponent(
-                meal_log_id=new_meal.id,
-                food_item=component_data.get('food_item', ''),
-                category=FoodCategory(component_data.get('category', 'other').lower()),
-                quantity=float(component_data.get('quantity', 0)),
-                unit=UnitType(component_data.get('unit', 'piece').lower()),
-                calories=int(component_data.get('calories', 0)),
-                protein=float(component_data.get('protein', 0)),
-                carbs=float(component_data.get('carbs', 0)),
-                fat=float(component_data.get('fat', 0))
-            )
-            db.add(component)
+        # Build meal components
+        component_rows = [
+            {
+                "food_item": component_data.get('food_item', ''),
+                "category": FoodCategory(component_data.get('category', 'other').lower()),
+                "quantity": float(component_data.get('quantity', 0)),
+                "unit": UnitType(component_data.get('unit', 'piece').lower()),
+                "calories": int(component_data.get('calories', 0)),
+                "protein": float(component_data.get('protein', 0)),
+                "carbs": float(component_data.get('carbs', 0)),
+                "fat": float(component_data.get('fat', 0))
+            }
+            for component_data in components
+        ]
         
-        db.commit()
+        new_meal_id = await run_db(
+            db, meal_service.create_meal,
+            user.id, meal_datetime, meal_type, notes, component_rows
+        )
         
         # Return JSON for AJAX requests, otherwise redirect
         if is_ajax:
             return JSONResponse({
                 "status": "success", 
                 "message": "Meal added successfully",
-                "meal_id": new_meal.id
+                "meal_id": new_meal_id
             })
         else:
             # Redirect back to the meal tracker page
@@ -830,7 +1104,6 @@ async def add_meal(
             )
         
     except ValueError as e:
-        db.rollback()
         if is_ajax:
             return JSONResponse(
                 status_code=400, 
@@ -839,7 +1112,6 @@ async def add_meal(
         else:
             raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        db.rollback()
         if is_ajax:
             return JSONResponse(
                 status_code=500, 
@@ -848,6 +1120,45 @@ async def add_meal(
         else:
             raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/foods/search")
+@login_required
+async def search_foods(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_route_db)
+):
+    """Autocomplete food names from the catalog."""
+    return {"items": await run_db(db, food_service.search_foods, q, limit)}
+
+def _parse_date_range(date_from: Optional[str], date_to: Optional[str]):
+    """Parse inclusive YYYY-MM-DD bounds into a `start <= date < end` datetime range."""
+    try:
+        start = datetime.strptime(date_from, "%Y-%m-%d") if date_from else None
+        end = datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1) if date_to else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
+    return start, end
+
+@app.get("/api/meals")
+@login_required
+async def list_meals(
+    request: Request,
+    limit: int = Query(settings.API_PAGE_SIZE, ge=1, le=settings.API_MAX_PAGE_SIZE),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+    db: Session = Depends(get_route_db)
+):
+    """Get a page of the user's meals with their components, newest first."""
+    user = request.state.user
+    start, end = _parse_date_range(date_from, date_to)
+    try:
+        return await run_db(db, meal_service.get_meal_page, user.id, limit, before, after, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.post("/api/meals")
 @login_required
 async def add_meal(
@@ -857,66 +1168,71 @@ async def add_meal(
     meal_type: str = Form(...),
     favorite_meal: Optional[int] = Form(None),
     notes: Optional[str] = Form(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_route_db)
 ):
     """Add a new meal log."""
     user = request.state.user
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    try:
-        # Parse the date and time
-        meal_date = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
-        
-        # Create meal log
-        meal = MealLog(
-            user_id=user.id,
-            date=meal_date,
-            meal_type=meal_type,
-            notes=notes
-        )
-        db.add(meal)
-        
-        # Add components
-        form_data = await request.form()
-        for key, value in form_data.items():
-            if key.startswith('components[') and '][food_item]' in key:
-                # Extract the index from the key
-                index = key[key.find('[')+1:key.find(']')]
-                
-                # Get all related component fields
-                food_item = form_data.get(f'components[{index}][food_item]')
-                category = form_data.get(f'components[{index}][category]')
-                quantity = float(form_data.get(f'components[{index}][quantity]', 0))
-                unit = form_data.get(f'components[{index}][unit]')
-                calories = float(form_data.get(f'components[{index}][calories]', 0))
-                protein = float(form_data.get(f'components[{index}][protein]', 0))
-                carbs = float(form_data.get(f'components[{index}][carbs]', 0))
-                fat = float(form_data.get(f'components[{index}][fat]', 0))
-                
-                if food_item and category:  # Only add if required fields are present
-                    component = MealComponent(
-                        meal_id=meal.id,
-                        food_item=food_item,
-                        category=category,
-                        quantity=quantity,
-                        unit=unit,
-                        calories=calories,
-                        protein=protein,
-                        carbs=carbs,
-                        fat=fat
-                    )
-                    db.add(component)
-        
-        db.commit()
-        return {"message": "Meal added successfully", "id": meal.id}
+    # Parse the date and time
+    meal_date = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
     
-    finally:
-        db.close()
+    # Collect components
+    components = []
+    form_data = await request.form()
+    for key, value in form_data.items():
+        if key.startswith('components[') and '][food_item]' in key:
+            # Extract the index from the key
+            index = key[key.find('[')+1:key.find(']')]
+            
+            # Get all related component fields
+            food_item = form_data.get(f'components[{index}][food_item]')
+            category = form_data.get(f'components[{index}][category]')
+            quantity = float(form_data.get(f'components[{index}][quantity]', 0))
+            unit = form_data.get(f'components[{index}][unit]')
+            calories = float(form_data.get(f'components[{index}][calories]', 0))
+            protein = float(form_data.get(f'components[{index}][protein]', 0))
+            carbs = float(form_data.get(f'components[{index}][carbs]', 0))
+            fat = float(form_data.get(f'components[{index}][fat]', 0))
+            
+            if food_item and category:  # Only add if required fields are present
+                components.append({
+                    "food_item": food_item,
+                    "category": category,
+                    "quantity": quantity,
+                    "unit": unit,
+                    "calories": calories,
+                    "protein": protein,
+                    "carbs": carbs,
+                    "fat": fat
+                })
+    
+    meal_id = await run_db(db, meal_service.create_meal, user.id, meal_date, meal_type, notes, components)
+    return {"message": "Meal added successfully", "id": meal_id}
+
+@app.post("/api/meals/import")
+@login_required
+async def import_meals(
+    request: Request,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or ndjson; defaults from the file extension"),
+    db: Session = Depends(get_route_db)
+):
+    """Bulk import meals from an uploaded CSV or NDJSON file."""
+    user = request.state.user
+    try:
+        fmt = meal_import.detect_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The upload is spooled to disk and decoded one line at a time, off the event loop
+    lines = meal_import.decode_lines(file.file)
+    return await run_db_offloaded(db, meal_import.import_meals, user.id, lines, fmt)
 
 @app.get("/api/meals/{meal_id}")
 @login_required
-async def get_meal(request: Request, meal_id: int, db: Session = Depends(get_db)):
+async def get_meal(request: Request, meal_id: int, db: Session = Depends(get_route_db)):
     """Get a specific meal log."""
     user = request.state.user
     if not user:
@@ -926,11 +1242,7 @@ async def get_meal(request: Request, meal_id: int, db: Session = Depends(get_db)
         )
     
     try:
-        meal = (
-            db.query(MealLog)
-            .filter(MealLog.id == meal_id, MealLog.user_id == user.id)
-            .first()
-        )
+        meal = await run_db(db, meal_service.get_user_meal, user.id, meal_id)
         
         if not meal:
             return JSONResponse(
@@ -944,6 +1256,7 @@ async def get_meal(request: Request, meal_id: int, db: Session = Depends(get_db)
             "meal_type": meal.meal_type.value,
             "components": [
                 {
+                    "id": c.id,
                     "food_item": c.food_item,
                     "category": c.category.value,
                     "quantity": c.quantity,
@@ -965,7 +1278,7 @@ async def get_meal(request: Request, meal_id: int, db: Session = Depends(get_db)
 
 @app.put("/api/meals/{meal_id}")
 @login_required
-async def update_meal(request: Request, meal_id: int, db: Session = Depends(get_db)):
+async def update_meal(request: Request, meal_id: int, db: Session = Depends(get_route_db)):
     """Update an existing meal log."""
     user = request.state.user
     if not user:
@@ -978,58 +1291,46 @@ async def update_meal(request: Request, meal_id: int, db: Session = Depends(get_
         # Get JSON data from request body
         meal_data = await request.json()
         
-        # Find the existing meal
-        existing_meal = (
-            db.query(MealLog)
-            .filter(MealLog.id == meal_id, MealLog.user_id == user.id)
-            .first()
-        )
-        
-        if not existing_meal:
-            return JSONResponse(
-                status_code=404, 
-                content={"detail": "Meal not found"}
-            )
-        
         # Parse the datetime string
         meal_date = datetime.strptime(meal_data['datetime'], '%Y-%m-%dT%H:%M')
+        meal_type = MealType(meal_data['meal_type'])
         
-        # Update meal log
-        existing_meal.date = meal_date
-        existing_meal.meal_type = MealType(meal_data['meal_type'])
-        
-        # Delete existing components
-        db.query(MealComponent).filter(MealComponent.meal_log_id == meal_id).delete()
+        components = [
+            {
+                "id": comp.get("id"),
+                "food_item": comp["food_item"],
+                "category": FoodCategory(comp["category"]),
+                "quantity": comp["quantity"],
+                "unit": UnitType(comp["unit"]),
+                "calories": comp["calories"],
+                "protein": comp["protein"],
+                "carbs": comp["carbs"],
+                "fat": comp["fat"]
+            }
+            for comp in meal_data['components']
+        ]
         
-        # Add new components
-        for comp in meal_data['components']:
-            component = MealComponent(
-                meal_log_id=existing_meal.id,
-                food_item=comp["food_item"],
-                category=FoodCategory(comp["category"]),
-                quantity=comp["quantity"],
-                unit=UnitType(comp["unit"]),
-                calories=comp["calories"],
-                protein=comp["protein"],
-                carbs=comp["carbs"],
-                fat=comp["fat"]
+        changes = await run_db(
+            db, meal_service.update_meal,
+            user.id, meal_id, meal_date, meal_type, components
+        )
+        if changes is None:
+            return JSONResponse(
+                status_code=404, 
+                content={"detail": "Meal not found"}
             )
-            db.add(component)
         
-        db.commit()
         return JSONResponse(
             status_code=200,
-            content={"message": "Meal updated successfully"}
+            content={"message": "Meal updated successfully", "components": changes}
         )
         
     except ValueError as e:
-        db.rollback()
         return JSONResponse(
             status_code=400,
             content={"detail": f"Invalid data format: {str(e)}"}
         )
     except Exception as e:
-        db.rollback()
         return JSONResponse(
             status_code=500,
             content={"detail": f"Error updating meal: {str(e)}"}
@@ -1038,7 +1339,7 @@ async def update_meal(request: Request, meal_id: int, db: Session = Depends(get_
 @app.delete("/api/meals/{meal_id}")
 @app.post("/api/meals/{meal_id}/delete")
 @login_required
-async def delete_meal(request: Request, meal_id: int, db: Session = Depends(get_db)):
+async def delete_meal(request: Request, meal_id: int, db: Session = Depends(get_route_db)):
     """Delete a meal log."""
     user = request.state.user
     if not user:
@@ -1048,32 +1349,20 @@ async def delete_meal(request: Request, meal_id: int, db: Session = Depends(get_
         )
     
     try:
-        meal = (
-            db.query(MealLog)
-            .filter(MealLog.id == meal_id, MealLog.user_id == user.id)
-            .first()
-        )
+        deleted = await run_db(db, meal_service.delete_meal, user.id, meal_id)
         
-        if not meal:
+        if not deleted:
             return JSONResponse(
                 status_code=404, 
                 content={"detail": "Meal not found"}
             )
         
-        # Delete associated meal components first
-        db.query(MealComponent).filter(MealComponent.meal_log_id == meal_id).delete()
-        
-        # Then delete the meal
-        db.delete(meal)
-        db.commit()
-        
         return JSONResponse(
             status_code=200,
             content={"message": "Meal deleted successfully"}
         )
     
     except Exception as e:
-        db.rollback()
         return JSONResponse(
             status_code=500,
             content={"detail": f"Error deleting meal: {str(e)}"}
@@ -1081,45 +1370,35 @@ async def delete_meal(request: Request, meal_id: int, db: Session = Depends(get_
 
 @app.get("/api/favorite-meals/{meal_id}")
 @login_required
-async def get_favorite_meal(request: Request, meal_id: int):
+async def get_favorite_meal(request: Request, meal_id: int, db: Session = Depends(get_route_db)):
     """Get a specific favorite meal."""
     user = request.state.user
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    db = next(get_db())
-    try:
-        meal = (
-            db.query(FavoriteMeal)
-            .filter(FavoriteMeal.id == meal_id, FavoriteMeal.user_id == user.id)
-            .options(selectinload(FavoriteMeal.components))
-            .first()
-        )
-        
-        if not meal:
-            raise HTTPException(status_code=404, detail="Favorite meal not found")
-        
-        return {
-            "id": meal.id,
-            "name": meal.name,
-            "meal_type": meal.meal_type,
-            "components": [
-                {
-                    "food_item": c.food_item,
-                    "category": c.category,
-                    "quantity": c.quantity,
-                    "unit": c.unit,
-                    "calories": c.calories,
-                    "protein": c.protein,
-                    "carbs": c.carbs,
-                    "fat": c.fat
-                }
-                for c in meal.components
-            ]
-        }
+    meal = await run_db(db, meal_service.get_favorite_meal, user.id, meal_id)
     
-    finally:
-        db.close()
+    if not meal:
+        raise HTTPException(status_code=404, detail="Favorite meal not found")
+    
+    return {
+        "id": meal.id,
+        "name": meal.name,
+        "meal_type": meal.meal_type,
+        "components": [
+            {
+                "food_item": c.food_item,
+                "category": c.category,
+                "quantity": c.quantity,
+                "unit": c.unit,
+                "calories": c.calories,
+                "protein": c.protein,
+                "carbs": c.carbs,
+                "fat": c.fat
+            }
+            for c in meal.components
+        ]
+    }
 
 @app.post("/api/favorite-meals")
 @login_required
@@ -1127,48 +1406,34 @@ async def add_favorite_meal(
     request: Request,
     name: str = Form(...),
     meal_type: str = Form(...),
-    components: List[Dict] = Form(...)
+    components: List[Dict] = Form(...),
+    db: Session = Depends(get_route_db)
 ):
     """Add a new favorite meal."""
     user = request.state.user
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    db = next(get_db())
-    try:
-        # Create favorite meal
-        meal = FavoriteMeal(
-            user_id=user.id,
-            name=name,
-            meal_type=meal_type
-        )
-        db.add(meal)
-        db.flush()  # Get meal.id
-        
-        # Add components
-        for comp in components:
-            component = FavoriteMealComponent(
-                meal_id=meal.id,
-                food_item=comp["food_item"],
-                category=comp["category"],
-                quantity=float(comp["quantity"]),
-                unit=comp["unit"],
-                calories=int(comp["calories"]),
-                protein=float(comp["protein"]) if comp.get("protein") else None,
-                carbs=float(comp["carbs"]) if comp.get("carbs") else None,
-                fat=float(comp["fat"]) if comp.get("fat") else None
-            )
-            db.add(component)
-        
-        db.commit()
-        return {"message": "Favorite meal added successfully", "id": meal.id}
+    component_rows = [
+        {
+            "food_item": comp["food_item"],
+            "category": comp["category"],
+            "quantity": float(comp["quantity"]),
+            "unit": comp["unit"],
+            "calories": int(comp["calories"]),
+            "protein": float(comp["protein"]) if comp.get("protein") else None,
+            "carbs": float(comp["carbs"]) if comp.get("carbs") else None,
+            "fat": float(comp["fat"]) if comp.get("fat") else None
+        }
+        for comp in components
+    ]
     
-    finally:
-        db.close()
+    meal_id = await run_db(db, meal_service.create_favorite_meal, user.id, name, meal_type, component_rows)
+    return {"message": "Favorite meal added successfully", "id": meal_id}
 
 @app.get("/exercise-tracker")
 @login_required
-async def exercise_tracker(request: Request, db: Session = Depends(get_db)):
+async def exercise_tracker(request: Request, db: Session = Depends(get_route_db)):
     user = request.state.user
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
@@ -1182,11 +1447,12 @@ async def exercise_tracker(request: Request, db: Session = Depends(get_db)):
     next_month = next_month.replace(day=1)
     
     # Fetch exercise logs for the current month
-    exercise_logs = db.query(ExerciseLog).filter(
-        ExerciseLog.user_id == user.id,
-        extract('month', ExerciseLog.date) == today.month,
-        extract('year', ExerciseLog.date) == today.year
-    ).order_by(ExerciseLog.date.desc()).all()
+    exercise_logs = await run_db(
+        db, exercise_service.get_exercise_logs_between,
+        user.id,
+        datetime(first_day.year, first_day.month, 1),
+        datetime(next_month.year, next_month.month, 1)
+    )
     
     return templates.TemplateResponse("exercise_tracker.html", {
         "request": request, 
@@ -1203,58 +1469,96 @@ async def exercise_tracker(request: Request, db: Session = Depends(get_db)):
 
 @app.post("/api/exercise-log")
 @login_required
-async def create_exercise_log(request: Request, db: Session = Depends(get_db)):
+async def create_exercise_log(request: Request, db: Session = Depends(get_route_db)):
     user = request.state.user
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
     try:
         exercise_data = await request.json()
-        
-        new_exercise_log = ExerciseLog(
-            user_id=user.id,
+        components = [
+            {
+                "exercise_name": component["exercise_name"],
+                "category": ExerciseCategory(component["category"]),
+                **{field: component.get(field) for field in ("sets", "reps", "weight", "distance")}
+            }
+            for component in exercise_data.get("components") or []
+        ]
+
+        # The log's own enums, not the survey's ExerciseType/ExerciseIntensity
+        return await run_db(
+            db, exercise_service.create_exercise_log, user.id,
+            components=components,
             date=datetime.now(),
-            exercise_type=ExerciseType(exercise_data['exercise_type']),
+            exercise_type=ExerciseLogType(exercise_data['exercise_type']),
             duration=float(exercise_data['duration']),
-            intensity=ExerciseIntensity(exercise_data['intensity']),
+            intensity=ExerciseLogIntensity(exercise_data['intensity']),
             notes=exercise_data.get('notes', '')
         )
-        
-        db.add(new_exercise_log)
-        db.commit()
-        db.refresh(new_exercise_log)
-        
-        return {
-            "id": new_exercise_log.id,
-            "date": new_exercise_log.date.isoformat(),
-            "exercise_type": new_exercise_log.exercise_type.value,
-            "duration": new_exercise_log.duration,
-            "intensity": new_exercise_log.intensity.value,
-            "notes": new_exercise_log.notes
-        }
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/api/exercise-logs")
 @login_required
-async def get_exercise_logs(request: Request, db: Session = Depends(get_db)):
+async def get_exercise_logs(
+    request: Request,
+    limit: int = Query(settings.API_PAGE_SIZE, ge=1, le=settings.API_MAX_PAGE_SIZE),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+    db: Session = Depends(get_route_db)
+):
+    """Get a page of the user's exercise logs, newest first."""
     user = request.state.user
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    exercise_logs = db.query(ExerciseLog).filter(ExerciseLog.user_id == user.id).order_by(ExerciseLog.date.desc()).all()
-    
-    return [
-        {
-            "id": log.id,
-            "date": log.date.isoformat(),
-            "exercise_type": log.exercise_type.value,
-            "duration": log.duration,
-            "intensity": log.intensity.value,
-            "notes": log.notes
-        } for log in exercise_logs
-    ]
+    start, end = _parse_date_range(date_from, date_to)
+    try:
+        return await run_db(
+            db, exercise_service.get_exercise_log_page,
+            user.id, limit, before, after, start, end
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _export_chunks(user_id: int, fmt: str, records: List[str]):
+    """Yield the encoded export one keyset batch at a time."""
+    if fmt == "csv":
+        yield export_service.csv_header()
+    # The body streams after the handler returns, so it reads through its own session
+    async with open_route_db() as db:
+        for record in records:
+            read_batch = export_service.BATCH_READERS[record]
+            after_id = 0
+            while True:
+                rows, after_id = await run_db(db, read_batch, user_id, after_id, settings.EXPORT_BATCH_SIZE)
+                if after_id is None:
+                    break
+                yield export_service.encode_rows(rows, fmt)
+
+@app.get("/api/export")
+@login_required
+async def export_history(
+    request: Request,
+    format: str = Query("ndjson", description="ndjson or csv"),
+    include: str = Query("meals,exercises", description="Comma-separated: meals, exercises"),
+    db: Session = Depends(get_route_db)  # authentication only; the body opens its own session
+):
+    """Stream the user's full meal and exercise history."""
+    user = request.state.user
+    records = [record.strip() for record in include.split(",") if record.strip()]
+    if format not in export_service.FORMATS or not records or any(r not in export_service.RECORDS for r in records):
+        raise HTTPException(status_code=400, detail="Invalid format or include")
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"calorie-tracker-export-{datetime.utcnow():%Y%m%d}.{format}"
+    return StreamingResponse(
+        _export_chunks(user.id, format, records),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 if __name__ == "__main__":
     import uvicorn
@@ -4,7 +4,9 @@ from app.db.base_class import Base  # noqa
 from app.models.user import User, UserProfile  # noqa
 from app.models.exercise import ExerciseLog, ExerciseComponent  # noqa
 from app.models.meal import MealLog, MealComponent, FavoriteMeal, FavoriteMealComponent  # noqa
-from app.models.knowledge import KnowledgeCategory, Comment  # noqa
+from app.models.knowledge import KnowledgeCategory, Comment, CommentLike  # noqa
+from app.models.nutrition import DailyNutritionSummary  # noqa
+from app.models.food import FoodItem  # noqa
 from app.core.enums import Gender, FitnessGoal, TimePreference, ExerciseType, PreferredSport  # noqa
 
 __all__ = [
@@ -17,8 +19,11 @@ __all__ = [
     "MealComponent", 
     "FavoriteMeal", 
     "FavoriteMealComponent",
+    "DailyNutritionSummary",
+    "FoodItem",
     "KnowledgeCategory",
     "Comment",
+    "CommentLike",
     "Gender",
     "FitnessGoal",
     "TimePreference",
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship
 from enum import Enum
 from typing import Optional
@@ -28,6 +28,10 @@ class ExerciseIntensity(str, Enum):
 
 class ExerciseLog(Base):
     __tablename__ = 'exercise_logs'
+    __table_args__ = (
+        # Exercise lists filter by user and date range
+        Index("ix_exercise_logs_user_id_date", "user_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -48,7 +52,7 @@ class ExerciseComponent(Base):
     __tablename__ = 'exercise_components'
 
     id = Column(Integer, primary_key=True, index=True)
-    exercise_log_id = Column(Integer, ForeignKey('exercise_logs.id'), nullable=False)
+    exercise_log_id = Column(Integer, ForeignKey('exercise_logs.id'), nullable=False, index=True)
     exercise_name = Column(String, nullable=False)
     category = Column(SQLAlchemyEnum(ExerciseCategory), nullable=False)
     
@@ -0,0 +1,32 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum
+from ..db.base_class import Base
+from .meal import FoodCategory, UnitType
+
+class FoodItem(Base):
+    """Catalog entry with nutrients per reference quantity"""
+    __tablename__ = "food_catalog"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False, unique=True, index=True)
+    category = Column(Enum(FoodCategory), nullable=False)
+    reference_quantity = Column(Float, nullable=False, default=100)
+    reference_unit = Column(Enum(UnitType), nullable=False, default=UnitType.GRAMS)
+    calories = Column(Float, nullable=False)
+    protein = Column(Float, nullable=False, default=0)
+    carbs = Column(Float, nullable=False, default=0)
+    fat = Column(Float, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "category": self.category.value,
+            "reference_quantity": self.reference_quantity,
+            "reference_unit": self.reference_unit.value,
+            "calories": self.calories,
+            "protein": self.protein,
+            "carbs": self.carbs,
+            "fat": self.fat
+        }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -12,6 +12,7 @@ class KnowledgeCategory(Base):
     title = Column(String, nullable=False)
     description = Column(String, nullable=False)
     content = Column(Text, nullable=False)  # Main article content
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")  # Kept in step by the comment services
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
@@ -21,9 +22,13 @@ class KnowledgeCategory(Base):
 class Comment(Base):
     """Comment model for knowledge base articles"""
     __tablename__ = "comments"
+    __table_args__ = (
+        # Comment threads page newest first within a category
+        Index("ix_comments_category_id_created_at", "category_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    category_id = Column(Integer, ForeignKey("knowledge_categories.id"), nullable=False)
+    category_id = Column(Integer, ForeignKey("knowledge_categories.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     content = Column(Text, nullable=False)
     likes = Column(Integer, default=0)
@@ -33,3 +38,15 @@ class Comment(Base):
     # Relationships
     category = relationship("KnowledgeCategory", back_populates="comments")
     user = relationship("User", back_populates="comments")
+
+class CommentLike(Base):
+    """One user's like of a comment; a user can like a comment once"""
+    __tablename__ = "comment_likes"
+    __table_args__ = (
+        UniqueConstraint("comment_id", "user_id", name="uq_comment_likes_comment_id_user_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    comment_id = Column(Integer, ForeignKey("comments.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
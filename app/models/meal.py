@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Boolean, Table
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Boolean, Table, Index
 from sqlalchemy.orm import relationship
 from ..db.base_class import Base
 import enum
@@ -29,6 +29,10 @@ class UnitType(str, enum.Enum):
 class MealLog(Base):
     """Model for logging meals"""
     __tablename__ = "meal_logs"
+    __table_args__ = (
+        # Day/month views filter by user and date range
+        Index("ix_meal_logs_user_id_date", "user_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -56,7 +60,7 @@ class MealComponent(Base):
     __tablename__ = "meal_components"
 
     id = Column(Integer, primary_key=True, index=True)
-    meal_log_id = Column(Integer, ForeignKey("meal_logs.id"), nullable=False)
+    meal_log_id = Column(Integer, ForeignKey("meal_logs.id"), nullable=False, index=True)
     food_item = Column(String, nullable=False)
     category = Column(Enum(FoodCategory), nullable=False)
     quantity = Column(Float, nullable=False)
@@ -65,6 +69,8 @@ class MealComponent(Base):
     protein = Column(Float)
     carbs = Column(Float)
     fat = Column(Float)
+    # `quantity` converted to grams by app.services.units, for cross-unit analytics
+    quantity_grams = Column(Float)
     
     # Relationships
     meal_log = relationship("MealLog", back_populates="components")
@@ -76,6 +82,7 @@ class MealComponent(Base):
             "category": self.category,
             "quantity": self.quantity,
             "unit": self.unit,
+            "quantity_grams": self.quantity_grams,
             "calories": self.calories,
             "protein": self.protein,
             "carbs": self.carbs,
@@ -110,7 +117,7 @@ class FavoriteMealComponent(Base):
     __tablename__ = "favorite_meal_components"
 
     id = Column(Integer, primary_key=True, index=True)
-    favorite_meal_id = Column(Integer, ForeignKey("favorite_meals.id"), nullable=False)
+    favorite_meal_id = Column(Integer, ForeignKey("favorite_meals.id"), nullable=False, index=True)
     food_item = Column(String, nullable=False)
     category = Column(Enum(FoodCategory), nullable=False)
     quantity = Column(Float, nullable=False)
@@ -0,0 +1,31 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, UniqueConstraint
+from ..db.base_class import Base
+
+class DailyNutritionSummary(Base):
+    """Per-user, per-day nutrition totals maintained alongside meal writes"""
+    __tablename__ = "daily_nutrition_summary"
+    __table_args__ = (
+        # One row per user and day; also serves range reads for a user
+        UniqueConstraint("user_id", "date", name="uq_daily_nutrition_summary_user_id_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    calories = Column(Float, nullable=False, default=0)
+    protein = Column(Float, nullable=False, default=0)
+    carbs = Column(Float, nullable=False, default=0)
+    fat = Column(Float, nullable=False, default=0)
+    meal_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "date": self.date.isoformat(),
+            "calories": self.calories,
+            "protein": self.protein,
+            "carbs": self.carbs,
+            "fat": self.fat,
+            "meal_count": self.meal_count
+        }
@@ -1,9 +1,10 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, DateTime, JSON, Enum
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, DateTime, JSON, Enum, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.sqltypes import Enum
 from datetime import datetime
 
 from app.db.base_class import Base
+from app.core.identity_cache import identity_cache
 from app.core.enums import (
     Gender, FitnessGoal, TimePreference, ExerciseType, PreferredSport,
     MedicalCondition, CommonMedication, CommonAllergy, PastInjury
@@ -38,6 +39,13 @@ class User(Base):
     comments = relationship("Comment", back_populates="user")
     exercise_logs = relationship("ExerciseLog", back_populates="user")
 
+@event.listens_for(User.is_active, "set")
+@event.listens_for(User.hashed_password, "set")
+def _invalidate_cached_identity(target, value, oldvalue, initiator):
+    """Drop cached identities when a user is deactivated or changes password."""
+    if target.id is not None and value != oldvalue:
+        identity_cache.invalidate_user(target.id)
+
 class UserProfile(Base):
     """User profile model for storing user preferences and health data"""
     __tablename__ = "user_profiles"
@@ -0,0 +1 @@
+"""Database-facing operations shared by the route handlers."""
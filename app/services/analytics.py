@@ -0,0 +1,148 @@
+"""Nutrition trend analytics.
+
+A user's days are read from `daily_nutrition_summary` as columns (one
+array per nutrient, already the sum of that day's components) and laid
+out on a dense calendar. Rolling averages, macro splits and goal
+adherence are then a few numpy operations however long the range, and
+the results are columnar as well: one list per series, aligned with
+`dates`, ready for charting.
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.nutrition import DailyNutritionSummary
+from app.models.user import UserProfile
+from app.services.nutrition import NUTRIENTS
+
+WINDOWS = (7, 30)
+MAX_DAYS = 3660  # about ten years
+# kcal per gram, in the order of NUTRIENTS[1:]
+MACROS = ("protein", "carbs", "fat")
+MACRO_KCAL = np.array([4.0, 4.0, 9.0])
+GOAL_FIELDS = {
+    "calories": UserProfile.daily_calorie_goal,
+    "protein": UserProfile.protein_goal,
+    "carbs": UserProfile.carbs_goal,
+    "fat": UserProfile.fat_goal
+}
+
+
+def _series(values: np.ndarray) -> List[Optional[float]]:
+    """Round an array for JSON, with NaN as null."""
+    return [None if v != v else v for v in np.round(values, 2).tolist()]
+
+def _columns(matrix: np.ndarray, names) -> Dict[str, List[Optional[float]]]:
+    return {name: _series(matrix[:, i]) for i, name in enumerate(names)}
+
+def load_daily_totals(db: Session, user_id: int, start: date, end: date) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Get a user's totals for `start <= date < end` on a dense calendar.
+
+    Returns the days (`datetime64[D]`), a days x NUTRIENTS matrix with zeros
+    for days without meals, and a mask of the days that were logged.
+    """
+    rows = db.execute(
+        select(DailyNutritionSummary.date, *(getattr(DailyNutritionSummary, n) for n in NUTRIENTS))
+        .where(
+            DailyNutritionSummary.user_id == user_id,
+            DailyNutritionSummary.date >= start,
+            DailyNutritionSummary.date < end
+        )
+    ).all()
+    dates = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D"))
+    totals = np.zeros((len(dates), len(NUTRIENTS)))
+    logged = np.zeros(len(dates), dtype=bool)
+    if rows:
+        days, *columns = zip(*rows)
+        index = (np.array(days, dtype="datetime64[D]") - dates[0]).astype(np.intp)
+        totals[index] = np.column_stack(columns)
+        logged[index] = True
+    return dates, totals, logged
+
+def rolling_mean(totals: np.ndarray, logged: np.ndarray, window: int) -> np.ndarray:
+    """Mean over the logged days of each trailing `window`-day span; NaN where none were logged."""
+    sums = np.vstack([np.zeros((1, totals.shape[1])), np.cumsum(totals, axis=0)])
+    counts = np.concatenate([[0], np.cumsum(logged)])
+    hi = np.arange(1, len(totals) + 1)
+    lo = np.maximum(hi - window, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (sums[hi] - sums[lo]) / (counts[hi] - counts[lo])[:, None]
+
+def macro_split(totals: np.ndarray) -> np.ndarray:
+    """Percent of macro energy from protein, carbs and fat per row; NaN for empty rows."""
+    kcal = totals[..., 1:] * MACRO_KCAL
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return 100 * kcal / kcal.sum(axis=-1, keepdims=True)
+
+def get_goals(db: Session, user_id: int) -> Optional[np.ndarray]:
+    """Get the user's daily goals in NUTRIENTS order, or None without a profile."""
+    row = db.execute(
+        select(*(GOAL_FIELDS[n] for n in NUTRIENTS)).where(UserProfile.user_id == user_id)
+    ).first()
+    return np.array(row, dtype=float) if row else None
+
+def goal_adherence(totals: np.ndarray, logged: np.ndarray, goals: np.ndarray) -> Dict:
+    """Daily intake relative to each goal, and how often logged days landed on target."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = np.where(goals > 0, totals / goals, np.nan)
+    ratio[~logged] = np.nan
+    on_target = np.abs(ratio[logged] - 1) <= settings.NUTRITION_GOAL_TOLERANCE
+    logged_ratio = ratio[logged]
+    adherence = {}
+    for i, nutrient in enumerate(NUTRIENTS):
+        known = ~np.isnan(logged_ratio[:, i])
+        adherence[nutrient] = {
+            "average_ratio": round(float(logged_ratio[known, i].mean()), 3) if known.any() else None,
+            "days_on_target": int(on_target[:, i].sum())
+        }
+    return {
+        "targets": dict(zip(NUTRIENTS, goals.tolist())),
+        "tolerance": settings.NUTRITION_GOAL_TOLERANCE,
+        "ratio": _columns(ratio, NUTRIENTS),
+        "adherence": adherence
+    }
+
+def nutrition_trends(db: Session, user_id: int, start: date, end: date) -> Dict:
+    """
+    Get daily totals, rolling averages, macro splits and goal adherence
+    for `start <= date < end`; raises ValueError for an invalid range.
+    """
+    days = (end - start).days
+    if days <= 0:
+        raise ValueError("end must be after start")
+    if days > MAX_DAYS:
+        raise ValueError(f"Range is limited to {MAX_DAYS} days")
+
+    # Read enough history that the first day's windows are complete
+    lookback = max(WINDOWS) - 1
+    dates, totals, logged = load_daily_totals(db, user_id, start - timedelta(days=lookback), end)
+    rolling = {window: rolling_mean(totals, logged, window)[lookback:] for window in WINDOWS}
+    dates, totals, logged = dates[lookback:], totals[lookback:], logged[lookback:]
+
+    logged_days = int(logged.sum())
+    averages = totals[logged].mean(axis=0) if logged_days else np.full(len(NUTRIENTS), np.nan)
+    goals = get_goals(db, user_id)
+
+    result = {
+        "start": start.isoformat(),
+        # Inclusive, like the `to` the caller asked for
+        "end": (end - timedelta(days=1)).isoformat(),
+        "dates": np.datetime_as_string(dates).tolist(),
+        "logged": logged.tolist(),
+        "totals": _columns(totals, NUTRIENTS),
+        "macro_split": _columns(macro_split(totals), MACROS),
+        "period": {
+            "logged_days": logged_days,
+            "averages": dict(zip(NUTRIENTS, _series(averages))),
+            "macro_split": dict(zip(MACROS, _series(macro_split(totals.sum(axis=0)))))
+        },
+        "goals": goal_adherence(totals, logged, goals) if goals is not None else None
+    }
+    for window, means in rolling.items():
+        result[f"rolling_{window}"] = _columns(means, NUTRIENTS)
+    return result
@@ -0,0 +1,147 @@
+"""Calorie burn estimates from MET values.
+
+Burn per minute is `MET * 3.5 * body weight (kg) / 200` (the ACSM
+formula). A component's MET comes from its category at the log's
+intensity; a log without components uses its exercise type instead. The
+log's duration is shared evenly between its components, and the log's
+total is the sum of its components.
+
+Estimates are stored when a log is written (`ExerciseLog.total_calories_burned`
+and `ExerciseComponent.calories_burned`), so reports only ever sum them.
+Logs written before that are filled in chunks by
+
+    python -m app.services.burn [--recompute]
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.exercise import ExerciseLog, ExerciseComponent, ExerciseType, ExerciseCategory, ExerciseIntensity
+from app.models.user import UserProfile
+
+DEFAULT_BODY_WEIGHT_KG = 70.0  # Used for users without a profile
+
+# MET at (low, medium, high) intensity, from the Compendium of Physical Activities
+TYPE_METS: Dict[ExerciseType, Tuple[float, float, float]] = {
+    ExerciseType.STRENGTH: (3.5, 5.0, 6.0),
+    ExerciseType.CARDIO: (4.0, 7.0, 10.0),
+    ExerciseType.FLEXIBILITY: (2.3, 2.5, 3.0),
+    ExerciseType.HIIT: (6.0, 8.0, 10.0),
+}
+CATEGORY_METS: Dict[ExerciseCategory, Tuple[float, float, float]] = {
+    ExerciseCategory.WEIGHT_TRAINING: (3.5, 5.0, 6.0),
+    ExerciseCategory.RUNNING: (7.0, 9.8, 11.5),
+    ExerciseCategory.CYCLING: (4.0, 6.8, 10.0),
+    ExerciseCategory.SWIMMING: (5.8, 8.3, 10.0),
+    ExerciseCategory.YOGA: (2.5, 3.0, 4.0),
+    ExerciseCategory.BODYWEIGHT: (3.8, 5.0, 8.0),
+}
+INTENSITY_COLUMNS = {ExerciseIntensity.LOW: 0, ExerciseIntensity.MEDIUM: 1, ExerciseIntensity.HIGH: 2}
+
+
+def met_value(
+    exercise_type: ExerciseType,
+    intensity: ExerciseIntensity,
+    category: Optional[ExerciseCategory] = None
+) -> float:
+    """MET for a category, or the exercise type when the category has no entry of its own."""
+    column = INTENSITY_COLUMNS[intensity]
+    if category in CATEGORY_METS:
+        return CATEGORY_METS[category][column]
+    return TYPE_METS[exercise_type][column]
+
+def kcal_burned(mets, weight_kg, minutes) -> np.ndarray:
+    """Calories burned; takes scalars or arrays."""
+    return np.asarray(mets) * 3.5 * np.asarray(weight_kg) / 200 * np.asarray(minutes)
+
+def estimate_burn(
+    exercise_type: ExerciseType,
+    intensity: ExerciseIntensity,
+    duration: float,
+    weight_kg: float,
+    categories: Sequence[ExerciseCategory] = ()
+) -> Tuple[int, List[int]]:
+    """Estimate a log's total burn and each component's share, in kcal."""
+    if not categories:
+        return int(round(float(kcal_burned(met_value(exercise_type, intensity), weight_kg, duration)))), []
+    mets = [met_value(exercise_type, intensity, category) for category in categories]
+    burned = np.round(kcal_burned(mets, weight_kg, duration / len(categories))).astype(int).tolist()
+    return sum(burned), burned
+
+def body_weight(db: Session, user_id: int) -> float:
+    """The user's weight from their profile, in kg."""
+    weight = db.execute(select(UserProfile.weight).where(UserProfile.user_id == user_id)).scalar()
+    return weight or DEFAULT_BODY_WEIGHT_KG
+
+def backfill_burn(db: Session, recompute: bool = False, chunk_size: int = 500) -> int:
+    """
+    Estimate burn for logs that have none (or all logs with `recompute`),
+    one chunk of logs per transaction; returns the number of logs updated.
+    """
+    updated = 0
+    after_id = 0
+    while True:
+        query = (
+            select(
+                ExerciseLog.id, ExerciseLog.exercise_type, ExerciseLog.intensity, ExerciseLog.duration,
+                UserProfile.weight
+            )
+            .outerjoin(UserProfile, UserProfile.user_id == ExerciseLog.user_id)
+            .where(ExerciseLog.id > after_id)
+            .order_by(ExerciseLog.id)
+            .limit(chunk_size)
+        )
+        if not recompute:
+            query = query.where(ExerciseLog.total_calories_burned.is_(None))
+        logs = db.execute(query).all()
+        if not logs:
+            return updated
+
+        components: Dict[int, List[Tuple[int, ExerciseCategory]]] = {}
+        for component_id, log_id, category in db.execute(
+            select(ExerciseComponent.id, ExerciseComponent.exercise_log_id, ExerciseComponent.category)
+            .where(ExerciseComponent.exercise_log_id.in_([log.id for log in logs]))
+            .order_by(ExerciseComponent.id)
+        ):
+            components.setdefault(log_id, []).append((component_id, category))
+
+        log_values, component_values = [], []
+        for log_id, exercise_type, intensity, duration, weight in logs:
+            parts = components.get(log_id, [])
+            total, burned = estimate_burn(
+                exercise_type, intensity, duration, weight or DEFAULT_BODY_WEIGHT_KG,
+                [category for _, category in parts]
+            )
+            log_values.append({"id": log_id, "total_calories_burned": total})
+            component_values.extend(
+                {"id": component_id, "calories_burned": kcal}
+                for (component_id, _), kcal in zip(parts, burned)
+            )
+        try:
+            db.execute(update(ExerciseLog), log_values)
+            if component_values:
+                db.execute(update(ExerciseComponent), component_values)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        updated += len(log_values)
+        after_id = logs[-1].id
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Estimate calorie burn for stored exercise logs.")
+    parser.add_argument("--recompute", action="store_true", help="also replace existing estimates")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print(f"Estimated burn for {backfill_burn(db, args.recompute)} exercise logs")
+    finally:
+        db.close()
@@ -0,0 +1,79 @@
+"""Daily energy balance: calories eaten against calories burned.
+
+Intake comes from `daily_nutrition_summary` and burn from the estimates
+stored on `exercise_logs`. Both are read, combined and grouped by day in
+a single statement, each side through its `(user_id, date)` index, with
+the profile's calorie goal as a scalar subquery.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List
+
+from sqlalchemy import Date, Float, func, literal, select, type_coerce, union_all
+from sqlalchemy.orm import Session
+
+from app.models.exercise import ExerciseLog
+from app.models.nutrition import DailyNutritionSummary
+from app.models.user import UserProfile
+
+MAX_DAYS = 3660
+
+
+def energy_balance_statement(user_id: int, start: date, end: date):
+    """Per-day intake and burn for `start <= date < end`, plus the calorie goal on every row."""
+    intake = select(
+        DailyNutritionSummary.date.label("day"),
+        DailyNutritionSummary.calories.label("intake"),
+        literal(0.0, Float).label("burned")
+    ).where(
+        DailyNutritionSummary.user_id == user_id,
+        DailyNutritionSummary.date >= start,
+        DailyNutritionSummary.date < end
+    )
+    burned = select(
+        type_coerce(func.date(ExerciseLog.date), Date).label("day"),
+        literal(0.0, Float).label("intake"),
+        func.coalesce(ExerciseLog.total_calories_burned, 0).label("burned")
+    ).where(
+        ExerciseLog.user_id == user_id,
+        ExerciseLog.date >= datetime.combine(start, time.min),
+        ExerciseLog.date < datetime.combine(end, time.min)
+    )
+    days = union_all(intake, burned).subquery()
+    goal = select(UserProfile.daily_calorie_goal).where(UserProfile.user_id == user_id).scalar_subquery()
+    return (
+        select(days.c.day, func.sum(days.c.intake), func.sum(days.c.burned), goal)
+        .group_by(days.c.day)
+        .order_by(days.c.day)
+    )
+
+def get_energy_balance(db: Session, user_id: int, start: date, end: date) -> Dict:
+    """
+    Get intake, burn, net calories and the difference from the calorie goal
+    for every day with `start <= date < end`; raises ValueError for an invalid range.
+    """
+    count = (end - start).days
+    if count <= 0:
+        raise ValueError("end must be after start")
+    if count > MAX_DAYS:
+        raise ValueError(f"Range is limited to {MAX_DAYS} days")
+
+    rows = db.execute(energy_balance_statement(user_id, start, end)).all()
+    goal = rows[0][3] if rows else db.execute(
+        select(UserProfile.daily_calorie_goal).where(UserProfile.user_id == user_id)
+    ).scalar()
+    totals = {day: (float(intake), float(burned)) for day, intake, burned, _ in rows}
+
+    days: List[Dict] = []
+    for offset in range(count):
+        day = start + timedelta(days=offset)
+        intake, burned = totals.get(day, (0.0, 0.0))
+        net = intake - burned
+        days.append({
+            "date": day.isoformat(),
+            "intake": round(intake, 1),
+            "burned": round(burned, 1),
+            "net": round(net, 1),
+            "goal_difference": round(net - goal, 1) if goal is not None else None
+        })
+    # `end` is reported inclusive, like the `to` the caller asked for
+    return {"start": start.isoformat(), "end": (end - timedelta(days=1)).isoformat(), "calorie_goal": goal, "days": days}
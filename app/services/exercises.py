@@ -0,0 +1,78 @@
+"""Exercise log queries and writes, runnable on sync or async sessions."""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.exercise import ExerciseLog, ExerciseComponent
+from app.services import burn
+from app.services.pagination import keyset_page
+
+
+def exercise_log_to_dict(log: ExerciseLog) -> Dict:
+    """Serialize an exercise log for the JSON API."""
+    return {
+        "id": log.id,
+        "date": log.date.isoformat(),
+        "exercise_type": log.exercise_type.value,
+        "duration": log.duration,
+        "intensity": log.intensity.value,
+        "total_calories_burned": log.total_calories_burned,
+        "notes": log.notes
+    }
+
+def get_exercise_logs_between(db: Session, user_id: int, start: datetime, end: datetime) -> List[ExerciseLog]:
+    """Get a user's exercise logs with `start <= date < end`, newest first."""
+    return (
+        db.query(ExerciseLog)
+        .filter(
+            ExerciseLog.user_id == user_id,
+            ExerciseLog.date >= start,
+            ExerciseLog.date < end
+        )
+        .options(selectinload(ExerciseLog.components))
+        .order_by(ExerciseLog.date.desc())
+        .all()
+    )
+
+def get_exercise_log_page(
+    db: Session,
+    user_id: int,
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Dict:
+    """Get one keyset page of a user's exercise logs with `start <= date < end`, serialized."""
+    query = db.query(ExerciseLog).filter(ExerciseLog.user_id == user_id)
+    if start is not None:
+        query = query.filter(ExerciseLog.date >= start)
+    if end is not None:
+        query = query.filter(ExerciseLog.date < end)
+    return keyset_page(
+        query, ExerciseLog.date, ExerciseLog.id, limit,
+        before=before, after=after, serialize=exercise_log_to_dict
+    )
+
+def create_exercise_log(db: Session, user_id: int, components: Optional[List[Dict]] = None, **fields) -> Dict:
+    """Create an exercise log and its components with burn estimates; returns it serialized."""
+    components = components or []
+    try:
+        total, burned = burn.estimate_burn(
+            fields["exercise_type"], fields["intensity"], fields["duration"],
+            burn.body_weight(db, user_id),
+            [component["category"] for component in components]
+        )
+        new_exercise_log = ExerciseLog(user_id=user_id, total_calories_burned=total, **fields)
+        new_exercise_log.components = [
+            ExerciseComponent(**component, calories_burned=kcal)
+            for component, kcal in zip(components, burned)
+        ]
+        db.add(new_exercise_log)
+        db.commit()
+        db.refresh(new_exercise_log)
+        return exercise_log_to_dict(new_exercise_log)
+    except Exception:
+        db.rollback()
+        raise
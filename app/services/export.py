@@ -0,0 +1,125 @@
+"""Meal and exercise history export in keyset-paginated batches.
+
+Rows are flat, one per component (or one per exercise log without
+components), so the meal rows of an export can be fed straight back into
+the bulk import. Meals without components have nothing the import could
+recreate and are left out.
+"""
+import csv
+import io
+import json
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.meal import MealLog
+from app.models.exercise import ExerciseLog
+
+FORMATS = ("ndjson", "csv")
+RECORDS = ("meals", "exercises")
+
+MEAL_COLUMNS = [
+    "datetime", "meal_type", "food_item", "category", "quantity", "unit",
+    "calories", "protein", "carbs", "fat", "notes"
+]
+EXERCISE_COLUMNS = [
+    "datetime", "exercise_type", "duration", "intensity", "total_calories_burned", "notes",
+    "exercise_name", "exercise_category", "sets", "reps", "weight", "distance", "calories_burned"
+]
+CSV_COLUMNS = ["record", "id"] + MEAL_COLUMNS + [c for c in EXERCISE_COLUMNS if c not in MEAL_COLUMNS]
+
+Batch = Tuple[List[Dict], Optional[int]]
+
+
+def _value(value):
+    return value.value if hasattr(value, "value") else value
+
+def meal_rows_after(db: Session, user_id: int, after_id: int, size: int) -> Batch:
+    """Get export rows for the next `size` meals with id > `after_id`; returns rows and the last id."""
+    meals = (
+        db.query(MealLog)
+        .filter(MealLog.user_id == user_id, MealLog.id > after_id)
+        .options(selectinload(MealLog.components))
+        .order_by(MealLog.id)
+        .limit(size)
+        .all()
+    )
+    rows = []
+    for meal in meals:
+        base = {
+            "record": "meal",
+            "id": meal.id,
+            "datetime": meal.date.strftime("%Y-%m-%dT%H:%M:%S"),
+            "meal_type": _value(meal.meal_type),
+            "notes": meal.notes
+        }
+        for component in meal.components:
+            rows.append({
+                **base,
+                "food_item": component.food_item,
+                "category": _value(component.category),
+                "quantity": component.quantity,
+                "unit": _value(component.unit),
+                "calories": component.calories,
+                "protein": component.protein,
+                "carbs": component.carbs,
+                "fat": component.fat
+            })
+        # Keep the session's identity map from growing with the export
+        db.expunge(meal)
+    return rows, (meals[-1].id if meals else None)
+
+def exercise_rows_after(db: Session, user_id: int, after_id: int, size: int) -> Batch:
+    """Get export rows for the next `size` exercise logs with id > `after_id`; returns rows and the last id."""
+    logs = (
+        db.query(ExerciseLog)
+        .filter(ExerciseLog.user_id == user_id, ExerciseLog.id > after_id)
+        .options(selectinload(ExerciseLog.components))
+        .order_by(ExerciseLog.id)
+        .limit(size)
+        .all()
+    )
+    rows = []
+    for log in logs:
+        base = {
+            "record": "exercise",
+            "id": log.id,
+            "datetime": log.date.strftime("%Y-%m-%dT%H:%M:%S"),
+            "exercise_type": _value(log.exercise_type),
+            "duration": log.duration,
+            "intensity": _value(log.intensity),
+            "total_calories_burned": log.total_calories_burned,
+            "notes": log.notes
+        }
+        if not log.components:
+            rows.append(base)
+        for component in log.components:
+            rows.append({
+                **base,
+                "exercise_name": component.exercise_name,
+                "exercise_category": _value(component.category),
+                "sets": component.sets,
+                "reps": component.reps,
+                "weight": component.weight,
+                "distance": component.distance,
+                "calories_burned": component.calories_burned
+            })
+        db.expunge(log)
+    return rows, (logs[-1].id if logs else None)
+
+BATCH_READERS = {"meals": meal_rows_after, "exercises": exercise_rows_after}
+
+
+def csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_COLUMNS)
+    return buffer.getvalue()
+
+def encode_rows(rows: List[Dict], fmt: str) -> str:
+    """Encode a batch of rows as NDJSON lines or CSV records (without header)."""
+    if fmt == "ndjson":
+        return "".join(json.dumps(row) + "\n" for row in rows)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, restval="")
+    writer.writerows(rows)
+    return buffer.getvalue()
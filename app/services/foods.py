@@ -0,0 +1,158 @@
+"""Food catalog loading and prefix search.
+
+Searches are answered from an in-memory index: a sorted array of
+`(key, food id)` pairs, with one key per word of each food name, so
+"rice" finds both "Rice, white" and "Brown rice". A prefix lookup is two
+bisections. The index is rebuilt when the catalog changes: immediately
+after `load_foods` in this process, and within
+`FOOD_CATALOG_RELOAD_SECONDS` for changes made elsewhere.
+"""
+import bisect
+import heapq
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.food import FoodItem
+from app.models.meal import FoodCategory, UnitType
+
+NUTRIENT_FIELDS = ("calories", "protein", "carbs", "fat")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse punctuation so "Rice, white" matches "rice white"."""
+    return " ".join(_WORD.findall(text.lower()))
+
+def catalog_version(db: Session) -> Tuple[int, Optional[datetime]]:
+    """Cheap fingerprint of the catalog: row count and latest change."""
+    count, latest = db.execute(select(func.count(FoodItem.id), func.max(FoodItem.updated_at))).one()
+    return count, latest
+
+
+class FoodIndex:
+    """Immutable-snapshot prefix index over the food catalog."""
+
+    def __init__(self):
+        # (sorted keys, food id per key, foods by id, normalized names by id), replaced as a whole
+        self._snapshot: Tuple[List[str], List[int], Dict[int, Dict], Dict[int, str]] = ([], [], {}, {})
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def build(self, foods: Iterable[Dict], version=None) -> None:
+        """Replace the index with `foods` (dicts as from `FoodItem.to_dict`)."""
+        entries = []
+        by_id = {}
+        names = {}
+        for food in foods:
+            by_id[food["id"]] = food
+            names[food["id"]] = normalize(food["name"])
+            words = names[food["id"]].split()
+            # Index from every word onward, so a query can start mid-name
+            for start in range(len(words)):
+                entries.append((" ".join(words[start:]), food["id"]))
+        entries.sort()
+        # Swap in a complete snapshot so concurrent searches never see a partial index
+        self._snapshot = ([key for key, _ in entries], [food_id for _, food_id in entries], by_id, names)
+        self._version = version
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Foods with a word starting with `query`, names that start with it first."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        keys, ids, foods, names = self._snapshot
+        lo = bisect.bisect_left(keys, prefix)
+        hi = bisect.bisect_left(keys, prefix + "\uffff", lo)
+
+        matches = set(ids[lo:hi])
+        best = heapq.nsmallest(
+            limit, matches,
+            key=lambda food_id: (not names[food_id].startswith(prefix), len(names[food_id]), names[food_id])
+        )
+        return [foods[food_id] for food_id in best]
+
+    def refresh(self, db: Session, force: bool = False) -> bool:
+        """Rebuild from the database if the catalog changed; returns True if rebuilt."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < settings.FOOD_CATALOG_RELOAD_SECONDS:
+            return False
+        with self._lock:
+            self._checked_at = now
+            version = catalog_version(db)
+            if not force and version == self._version:
+                return False
+            self.build((food.to_dict() for food in db.query(FoodItem)), version)
+            return True
+
+    def invalidate(self) -> None:
+        """Force the next `refresh` to check the database."""
+        self._checked_at = 0.0
+        self._version = None
+
+    def __len__(self) -> int:
+        return len(self._snapshot[2])
+
+
+food_index = FoodIndex()
+
+
+def search_foods(db: Session, query: str, limit: int = 10) -> List[Dict]:
+    """Search the catalog, reloading the index first if it is stale."""
+    food_index.refresh(db)
+    return food_index.search(query, limit)
+
+def parse_food_row(row: Dict) -> Dict:
+    """Validate a catalog row (e.g. from the seed CSV); raises ValueError."""
+    name = (row.get("name") or "").strip()
+    if not name:
+        raise ValueError("Missing name")
+    values = {
+        "name": name,
+        "category": FoodCategory(row["category"].strip().lower()),
+        "reference_quantity": float(row.get("reference_quantity") or 100),
+        "reference_unit": UnitType(row.get("reference_unit", "").strip().lower() or UnitType.GRAMS.value)
+    }
+    for field in NUTRIENT_FIELDS:
+        values[field] = float(row.get(field) or 0)
+    return values
+
+def load_foods(db: Session, rows: Iterable[Dict], batch_size: int = 500) -> int:
+    """Upsert catalog rows by name in multi-row batches; returns the number written."""
+    insert_for = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    written = 0
+    batch = []
+
+    def flush():
+        nonlocal written
+        if not batch:
+            return
+        stmt = insert_for(FoodItem).values(batch)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={name: stmt.excluded[name] for name in batch[0] if name != "name"}
+        ))
+        written += len(batch)
+        batch.clear()
+
+    now = datetime.utcnow()
+    try:
+        for row in rows:
+            batch.append({**parse_food_row(row), "updated_at": now})
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    food_index.invalidate()
+    return written
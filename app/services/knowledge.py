@@ -0,0 +1,206 @@
+"""Knowledge base queries and writes, runnable on sync or async sessions.
+
+Likes are recorded once per user in `comment_likes`, and the count on the
+comment is incremented in the database, so concurrent likes never lose an
+update. With `COMMENT_LIKES_BUFFERED` set, likes are held in `like_buffer`
+instead and written every `COMMENT_LIKES_FLUSH_SECONDS` as one INSERT and
+one batched UPDATE for the whole burst.
+"""
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.models.knowledge import KnowledgeCategory, Comment, CommentLike
+from app.services.pagination import keyset_page
+
+
+class NotAuthorizedError(Exception):
+    """Raised when a user acts on content they do not own."""
+
+
+def get_categories(db: Session) -> List[KnowledgeCategory]:
+    """Get all knowledge categories."""
+    return db.query(KnowledgeCategory).all()
+
+def categories_version(db: Session) -> Tuple:
+    """Cheap fingerprint of the category list: row count, highest id and latest change."""
+    return tuple(db.execute(
+        select(func.count(KnowledgeCategory.id), func.max(KnowledgeCategory.id), func.max(KnowledgeCategory.updated_at))
+    ).one())
+
+def category_version(db: Session, category_id: int) -> Optional[Tuple]:
+    """
+    Cheap fingerprint of a category page: the article's `updated_at` plus
+    the count, latest id, latest change and total likes of its comments.
+    Returns None if the category does not exist.
+    """
+    row = db.execute(
+        select(
+            KnowledgeCategory.updated_at,
+            func.count(Comment.id),
+            func.max(Comment.id),
+            func.max(Comment.updated_at),
+            func.coalesce(func.sum(Comment.likes), 0)
+        )
+        .outerjoin(Comment, Comment.category_id == KnowledgeCategory.id)
+        .where(KnowledgeCategory.id == category_id)
+        .group_by(KnowledgeCategory.id)
+    ).first()
+    return tuple(row) if row else None
+
+def get_category(db: Session, category_id: int) -> Optional[KnowledgeCategory]:
+    """Get a category without its comments."""
+    return db.query(KnowledgeCategory).filter(KnowledgeCategory.id == category_id).first()
+
+def get_comment_page(
+    db: Session,
+    category_id: int,
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None
+) -> Dict:
+    """Get one keyset page of a category's comments, newest first, with their authors loaded."""
+    query = (
+        db.query(Comment)
+        .filter(Comment.category_id == category_id)
+        .options(joinedload(Comment.user))
+    )
+    return keyset_page(query, Comment.created_at, Comment.id, limit, before=before, after=after)
+
+def _adjust_comment_count(db: Session, category_id: int, delta: int) -> None:
+    """Add `delta` to a category's comment count in the database, leaving `updated_at` alone."""
+    db.execute(
+        update(KnowledgeCategory)
+        .where(KnowledgeCategory.id == category_id)
+        .values(
+            comment_count=KnowledgeCategory.comment_count + delta,
+            updated_at=KnowledgeCategory.updated_at
+        )
+    )
+
+def add_comment(db: Session, category_id: int, user_id: int, content: str) -> int:
+    """Add a comment to a category; returns the new comment id."""
+    comment = Comment(
+        category_id=category_id,
+        user_id=user_id,
+        content=content,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+    try:
+        db.add(comment)
+        _adjust_comment_count(db, category_id, 1)
+        db.commit()
+        return comment.id
+    except Exception:
+        db.rollback()
+        raise
+
+def record_likes(db: Session, likes: Iterable[Tuple[int, int]]) -> int:
+    """
+    Record `(comment_id, user_id)` likes in one statement, skipping any a
+    user already gave, and add the new ones to the comments' counts in
+    one batched UPDATE. The caller commits. Returns the number of new likes.
+    """
+    likes = set(likes)
+    # A comment may have been deleted while its likes sat in the buffer
+    existing = set(db.execute(
+        select(Comment.id).where(Comment.id.in_({comment_id for comment_id, _ in likes}))
+    ).scalars()) if likes else set()
+    likes = {like for like in likes if like[0] in existing}
+    if not likes:
+        return 0
+    insert_for = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    now = datetime.utcnow()
+    added = Counter(db.execute(
+        insert_for(CommentLike)
+        .values([{"comment_id": comment_id, "user_id": user_id, "created_at": now} for comment_id, user_id in likes])
+        .on_conflict_do_nothing(index_elements=["comment_id", "user_id"])
+        .returning(CommentLike.comment_id)
+    ).scalars())
+    if added:
+        comments = Comment.__table__
+        db.execute(
+            update(comments)
+            .where(comments.c.id == bindparam("comment"))
+            .values(likes=func.coalesce(comments.c.likes, 0) + bindparam("added"), updated_at=comments.c.updated_at),
+            [{"comment": comment_id, "added": count} for comment_id, count in added.items()]
+        )
+    return sum(added.values())
+
+
+class LikeBuffer:
+    """Likes waiting to be written; repeats within a burst collapse to one."""
+
+    def __init__(self):
+        self._pending: Set[Tuple[int, int]] = set()
+        self._lock = threading.Lock()
+
+    def add(self, comment_id: int, user_id: int) -> None:
+        with self._lock:
+            self._pending.add((comment_id, user_id))
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def flush(self, db: Session) -> int:
+        """Write all pending likes in one transaction; returns the number of new likes."""
+        with self._lock:
+            likes, self._pending = self._pending, set()
+        try:
+            added = record_likes(db, likes)
+            db.commit()
+            return added
+        except Exception:
+            db.rollback()
+            # Keep them for the next flush
+            with self._lock:
+                self._pending |= likes
+            raise
+
+
+like_buffer = LikeBuffer()
+
+
+def like_comment(db: Session, comment_id: int, user_id: int) -> Optional[int]:
+    """Like a comment once per user; returns its category id, or None if not found."""
+    category_id = db.execute(select(Comment.category_id).where(Comment.id == comment_id)).scalar()
+    if category_id is None:
+        return None
+
+    if settings.COMMENT_LIKES_BUFFERED:
+        like_buffer.add(comment_id, user_id)
+        return category_id
+    try:
+        record_likes(db, [(comment_id, user_id)])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return category_id
+
+def delete_comment(db: Session, comment_id: int, user_id: int) -> Optional[int]:
+    """Delete a user's own comment; returns its category id, or None if not found."""
+    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    if not comment:
+        return None
+
+    if comment.user_id != user_id:
+        raise NotAuthorizedError("Not authorized to delete this comment")
+
+    category_id = comment.category_id
+    try:
+        db.execute(delete(CommentLike).where(CommentLike.comment_id == comment_id))
+        db.delete(comment)
+        _adjust_comment_count(db, category_id, -1)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return category_id
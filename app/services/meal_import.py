@@ -0,0 +1,220 @@
+"""Bulk meal import from CSV or NDJSON.
+
+Each input row is one meal component. Consecutive rows sharing the same
+`datetime` and `meal_type` form one meal; `notes` is taken from the
+meal's first row. Columns (CSV header or NDJSON keys):
+
+    datetime, meal_type, food_item, category, quantity, unit,
+    calories, protein, carbs, fat, notes
+
+Rows are read one at a time and written in chunked multi-row INSERTs, one
+transaction per batch of meals, so memory use does not grow with the file.
+Invalid rows are skipped and reported; the rest of the file still imports.
+If the file itself stops being readable (bad encoding, broken CSV quoting),
+the import ends there: meals read before that point are still written and
+the report gives the last line read, so a retry can resume after it.
+"""
+import codecs
+import csv
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.meal import MealLog, MealComponent, MealType, FoodCategory, UnitType
+from app.services import nutrition
+from app.services.units import with_grams
+
+FORMATS = ("csv", "ndjson")
+DATETIME_FORMATS = ("%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S")
+
+
+class RowError(ValueError):
+    """Raised for an input row that cannot be imported."""
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import, returned to the client as JSON."""
+    imported_meals: int = 0
+    imported_components: int = 0
+    failed_rows: int = 0
+    errors: List[Dict] = field(default_factory=list)
+    stopped_after_line: Optional[int] = None
+
+    def add_error(self, line: int, message: str) -> None:
+        self.failed_rows += 1
+        if len(self.errors) < settings.MEAL_IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def to_dict(self) -> Dict:
+        return {
+            "imported_meals": self.imported_meals,
+            "imported_components": self.imported_components,
+            "failed_rows": self.failed_rows,
+            "errors": self.errors,
+            "errors_truncated": self.failed_rows > len(self.errors),
+            "stopped_after_line": self.stopped_after_line
+        }
+
+
+def detect_format(filename: Optional[str], requested: Optional[str] = None) -> str:
+    """Pick the input format from an explicit choice or the file extension."""
+    if requested:
+        if requested.lower() not in FORMATS:
+            raise ValueError(f"Unsupported format {requested!r}; use one of {', '.join(FORMATS)}")
+        return requested.lower()
+    if filename and filename.lower().endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "csv"
+
+def decode_lines(raw: Iterable[bytes]) -> Iterator[str]:
+    """Decode UTF-8 lines one by one, so a bad byte fails on its own line rather than a whole buffer."""
+    for line_number, line in enumerate(raw, start=1):
+        if line_number == 1:
+            line = line.removeprefix(codecs.BOM_UTF8)
+        yield line.decode("utf-8")
+
+def read_rows(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, object]]:
+    """Yield `(line number, raw row)` pairs; malformed rows come back as `RowError`."""
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, RowError(f"Invalid JSON: {e.msg}")
+            continue
+        yield line_number, row if isinstance(row, dict) else RowError("Expected a JSON object")
+
+def _enum(enum_cls, value, name):
+    if isinstance(value, str):
+        value = value.strip()
+        for member in enum_cls:
+            if value.lower() in (member.value.lower(), member.name.lower()):
+                return member
+    choices = ", ".join(member.value for member in enum_cls)
+    raise RowError(f"Invalid {name} {value!r}; expected one of {choices}")
+
+def _number(row: Dict, name: str, required: bool = False) -> Optional[float]:
+    value = row.get(name)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise RowError(f"Missing {name}")
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise RowError(f"Invalid {name} {value!r}")
+    if number < 0:
+        raise RowError(f"{name} must not be negative")
+    return number
+
+def _datetime(value) -> datetime:
+    if isinstance(value, str):
+        for fmt in DATETIME_FORMATS:
+            try:
+                return datetime.strptime(value.strip(), fmt)
+            except ValueError:
+                pass
+    raise RowError(f"Invalid datetime {value!r}; expected YYYY-MM-DDTHH:MM")
+
+def parse_row(row: Dict) -> Tuple[Tuple[datetime, MealType], Optional[str], Dict]:
+    """Validate a raw row; returns the meal key, notes and component values."""
+    food_item = (row.get("food_item") or "").strip()
+    if not food_item:
+        raise RowError("Missing food_item")
+    key = (_datetime(row.get("datetime")), _enum(MealType, row.get("meal_type"), "meal_type"))
+    component = {
+        "food_item": food_item,
+        "category": _enum(FoodCategory, row.get("category"), "category"),
+        "quantity": _number(row, "quantity", required=True),
+        "unit": _enum(UnitType, row.get("unit"), "unit"),
+        "calories": _number(row, "calories", required=True),
+        "protein": _number(row, "protein"),
+        "carbs": _number(row, "carbs"),
+        "fat": _number(row, "fat")
+    }
+    return key, (row.get("notes") or None), component
+
+def _write_batch(db: Session, user_id: int, meals: List[Tuple[Tuple[datetime, MealType], Optional[str], List[Dict]]]) -> int:
+    """Insert a batch of meals with their components and rollups in one transaction."""
+    try:
+        meal_ids = db.execute(
+            insert(MealLog).returning(MealLog.id, sort_by_parameter_order=True),
+            [
+                {"user_id": user_id, "date": meal_date, "meal_type": meal_type, "notes": notes}
+                for (meal_date, meal_type), notes, _ in meals
+            ]
+        ).scalars().all()
+
+        component_rows = []
+        day_totals: Dict[date, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(nutrition.NUTRIENTS, 0.0))
+        day_meals: Dict[date, int] = defaultdict(int)
+        for meal_id, ((meal_date, _), _, components) in zip(meal_ids, meals):
+            component_rows.extend({"meal_log_id": meal_id, **component} for component in components)
+            totals = nutrition.totals_of(components)
+            for nutrient in nutrition.NUTRIENTS:
+                day_totals[meal_date.date()][nutrient] += totals[nutrient]
+            day_meals[meal_date.date()] += 1
+
+        # One vectorized unit conversion for the whole batch
+        db.execute(insert(MealComponent), with_grams(component_rows))
+        for day, totals in day_totals.items():
+            nutrition.apply_delta(db, user_id, day, totals, meals=day_meals[day])
+        db.commit()
+        return len(component_rows)
+    except Exception:
+        db.rollback()
+        raise
+
+def import_meals(db: Session, user_id: int, lines: Iterable[str], fmt: str) -> Dict:
+    """Import meals for a user from CSV or NDJSON lines; returns the report."""
+    report = ImportReport()
+    batch = []
+    current_key = None
+
+    def flush():
+        if batch:
+            report.imported_components += _write_batch(db, user_id, batch)
+            report.imported_meals += len(batch)
+            batch.clear()
+
+    last_line = 0
+    try:
+        for line_number, raw in read_rows(lines, fmt):
+            last_line = line_number
+            try:
+                if isinstance(raw, RowError):
+                    raise raw
+                key, notes, component = parse_row(raw)
+            except RowError as e:
+                report.add_error(line_number, str(e))
+                continue
+
+            if key == current_key:
+                batch[-1][2].append(component)
+                continue
+            # Only cut a batch between meals so a meal is never split
+            if len(batch) >= settings.MEAL_IMPORT_BATCH_SIZE:
+                flush()
+            batch.append((key, notes, [component]))
+            current_key = key
+    except (UnicodeDecodeError, csv.Error) as e:
+        # Earlier batches are already committed; report them rather than failing the whole file
+        report.add_error(last_line + 1, f"Could not read file: {e}")
+        report.stopped_after_line = last_line
+
+    flush()
+    return report.to_dict()
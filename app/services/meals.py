@@ -0,0 +1,231 @@
+"""Meal log queries and writes.
+
+Every function takes the session as its first argument so it can run
+directly on a sync `Session` or through `run_db` on an `AsyncSession`.
+Relationships the callers render are loaded eagerly. Writes keep the
+daily nutrition summary in step within the same transaction.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.meal import MealLog, MealComponent, FavoriteMeal, FavoriteMealComponent, MealType
+from app.services import nutrition
+from app.services.pagination import keyset_page
+from app.services.units import with_grams
+
+COMPONENT_FIELDS = ("food_item", "category", "quantity", "unit", "calories", "protein", "carbs", "fat")
+
+
+def get_meals_between(
+    db: Session,
+    user_id: int,
+    start: datetime,
+    end: datetime,
+    descending: bool = False,
+    limit: Optional[int] = None
+) -> List[MealLog]:
+    """Get a user's meals with `start <= date < end` (at most `limit`), components included."""
+    order = MealLog.date.desc() if descending else MealLog.date
+    query = (
+        db.query(MealLog)
+        .filter(
+            MealLog.user_id == user_id,
+            MealLog.date >= start,
+            MealLog.date < end
+        )
+        .options(selectinload(MealLog.components))
+        .order_by(order, MealLog.id)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+def get_meal_page(
+    db: Session,
+    user_id: int,
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Dict:
+    """Get one keyset page of a user's meals with `start <= date < end`, serialized."""
+    query = db.query(MealLog).filter(MealLog.user_id == user_id).options(selectinload(MealLog.components))
+    if start is not None:
+        query = query.filter(MealLog.date >= start)
+    if end is not None:
+        query = query.filter(MealLog.date < end)
+    return keyset_page(
+        query, MealLog.date, MealLog.id, limit,
+        before=before, after=after, serialize=MealLog.to_dict
+    )
+
+def get_user_meal(db: Session, user_id: int, meal_id: int) -> Optional[MealLog]:
+    """Get a single meal owned by the user, components included."""
+    return (
+        db.query(MealLog)
+        .filter(MealLog.id == meal_id, MealLog.user_id == user_id)
+        .options(selectinload(MealLog.components))
+        .first()
+    )
+
+def create_meal(
+    db: Session,
+    user_id: int,
+    meal_date: datetime,
+    meal_type: MealType,
+    notes: Optional[str],
+    components: List[Dict]
+) -> int:
+    """Create a meal and its components; returns the new meal id."""
+    try:
+        meal = MealLog(
+            user_id=user_id,
+            date=meal_date,
+            meal_type=meal_type,
+            notes=notes
+        )
+        db.add(meal)
+        db.flush()  # This assigns the ID to meal without committing the transaction
+
+        for component_data in with_grams(components):
+            db.add(MealComponent(meal_log_id=meal.id, **component_data))
+
+        nutrition.apply_delta(db, user_id, meal_date.date(), nutrition.totals_of(components), meals=1)
+        db.commit()
+        return meal.id
+    except Exception:
+        db.rollback()
+        raise
+
+def update_meal(
+    db: Session,
+    user_id: int,
+    meal_id: int,
+    meal_date: datetime,
+    meal_type: MealType,
+    components: List[Dict]
+) -> Optional[Dict[str, int]]:
+    """
+    Update a meal's details and components; returns None if not found.
+
+    Incoming components carrying the `id` of one of this meal's components
+    update that row, only if a value changed. Components without a known id
+    are inserted, and stored components left unmatched are deleted. Each
+    kind of change goes out as a single bulk statement. Returns how many
+    component rows were updated, inserted and deleted.
+    """
+    try:
+        existing_meal = (
+            db.query(MealLog)
+            .filter(MealLog.id == meal_id, MealLog.user_id == user_id)
+            .first()
+        )
+        if not existing_meal:
+            return None
+
+        stored = {
+            row.id: row._asdict()
+            for row in db.execute(
+                select(MealComponent.id, *(getattr(MealComponent, f) for f in COMPONENT_FIELDS))
+                .where(MealComponent.meal_log_id == meal_id)
+            )
+        }
+        old_day = existing_meal.date.date()
+        old_totals = nutrition.totals_of(stored.values())
+        new_totals = nutrition.totals_of(components)
+
+        to_update, to_insert, matched = [], [], set()
+        for component_data in components:
+            values = {field: component_data.get(field) for field in COMPONENT_FIELDS}
+            component_id = component_data.get("id")
+            current = stored.get(component_id)
+            if current is None or component_id in matched:
+                to_insert.append({"meal_log_id": meal_id, **values})
+                continue
+            matched.add(component_id)
+            if any(current[field] != values[field] for field in COMPONENT_FIELDS):
+                to_update.append({"id": component_id, **values})
+        to_delete = [component_id for component_id in stored if component_id not in matched]
+
+        if to_update:
+            db.execute(update(MealComponent), with_grams(to_update))
+        if to_insert:
+            db.execute(insert(MealComponent), with_grams(to_insert))
+        if to_delete:
+            db.execute(delete(MealComponent).where(MealComponent.id.in_(to_delete)))
+
+        if existing_meal.date != meal_date:
+            existing_meal.date = meal_date
+        if existing_meal.meal_type != meal_type:
+            existing_meal.meal_type = meal_type
+
+        if old_day == meal_date.date():
+            diff = {n: new_totals[n] - old_totals[n] for n in nutrition.NUTRIENTS}
+            if any(diff.values()):
+                nutrition.apply_delta(db, user_id, old_day, diff, meals=0)
+        else:
+            nutrition.apply_delta(db, user_id, old_day, {n: -v for n, v in old_totals.items()}, meals=-1)
+            nutrition.apply_delta(db, user_id, meal_date.date(), new_totals, meals=1)
+        db.commit()
+        return {"updated": len(to_update), "inserted": len(to_insert), "deleted": len(to_delete)}
+    except Exception:
+        db.rollback()
+        raise
+
+def delete_meal(db: Session, user_id: int, meal_id: int) -> bool:
+    """Delete a meal and its components; returns False if not found."""
+    try:
+        meal = (
+            db.query(MealLog)
+            .filter(MealLog.id == meal_id, MealLog.user_id == user_id)
+            .first()
+        )
+        if not meal:
+            return False
+
+        totals = nutrition.meal_totals(db, meal_id)
+        nutrition.apply_delta(db, user_id, meal.date.date(), {n: -v for n, v in totals.items()}, meals=-1)
+
+        # Delete associated meal components first
+        db.query(MealComponent).filter(MealComponent.meal_log_id == meal_id).delete()
+
+        # Then delete the meal
+        db.delete(meal)
+        db.commit()
+        return True
+    except Exception:
+        db.rollback()
+        raise
+
+def get_favorite_meal(db: Session, user_id: int, meal_id: int) -> Optional[FavoriteMeal]:
+    """Get a favorite meal owned by the user, components included."""
+    return (
+        db.query(FavoriteMeal)
+        .filter(FavoriteMeal.id == meal_id, FavoriteMeal.user_id == user_id)
+        .options(selectinload(FavoriteMeal.components))
+        .first()
+    )
+
+def create_favorite_meal(db: Session, user_id: int, name: str, meal_type: str, components: List[Dict]) -> int:
+    """Create a favorite meal and its components; returns the new id."""
+    try:
+        meal = FavoriteMeal(
+            user_id=user_id,
+            name=name,
+            meal_type=meal_type
+        )
+        db.add(meal)
+        db.flush()  # Get meal.id
+
+        for component_data in components:
+            db.add(FavoriteMealComponent(favorite_meal_id=meal.id, **component_data))
+
+        db.commit()
+        return meal.id
+    except Exception:
+        db.rollback()
+        raise
@@ -0,0 +1,150 @@
+"""Daily nutrition rollups, kept in step with meal writes.
+
+`daily_nutrition_summary` holds one row per user and day. The meal
+services apply deltas to it inside their own transaction, so totals for a
+day, week or month are single-row or range reads. `rebuild_summaries`
+recomputes the table from the meal logs for backfill and drift repair:
+
+    python -m app.services.nutrition [--user-id ID]
+"""
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import DateTime, delete, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.meal import MealLog, MealComponent
+from app.models.nutrition import DailyNutritionSummary
+
+NUTRIENTS = ("calories", "protein", "carbs", "fat")
+
+
+def totals_of(components: Iterable) -> Dict[str, float]:
+    """Sum nutrients over component dicts or `MealComponent` rows."""
+    totals = dict.fromkeys(NUTRIENTS, 0.0)
+    for component in components:
+        for nutrient in NUTRIENTS:
+            value = component.get(nutrient) if isinstance(component, dict) else getattr(component, nutrient)
+            totals[nutrient] += float(value or 0)
+    return totals
+
+def meal_totals(db: Session, meal_id: int) -> Dict[str, float]:
+    """Sum a stored meal's components in the database."""
+    row = db.execute(
+        select(*(func.coalesce(func.sum(getattr(MealComponent, n)), 0.0) for n in NUTRIENTS))
+        .where(MealComponent.meal_log_id == meal_id)
+    ).one()
+    return {nutrient: float(value) for nutrient, value in zip(NUTRIENTS, row)}
+
+def _insert_for(db: Session):
+    dialect = db.get_bind().dialect.name
+    return postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+def apply_delta(db: Session, user_id: int, day: date, totals: Dict[str, float], meals: int) -> None:
+    """
+    Add `totals` and `meals` (either may be negative) to a user's day.
+
+    Runs as a single upsert in the caller's transaction; the caller commits.
+    Days left without meals are removed.
+    """
+    values = {nutrient: totals[nutrient] for nutrient in NUTRIENTS}
+    values["meal_count"] = meals
+    stmt = _insert_for(db)(DailyNutritionSummary).values(
+        user_id=user_id, date=day, updated_at=datetime.utcnow(), **values
+    )
+    update = {name: getattr(DailyNutritionSummary, name) + stmt.excluded[name] for name in values}
+    update["updated_at"] = stmt.excluded.updated_at
+    db.execute(stmt.on_conflict_do_update(index_elements=["user_id", "date"], set_=update))
+
+    if meals < 0:
+        db.execute(
+            delete(DailyNutritionSummary)
+            .where(
+                DailyNutritionSummary.user_id == user_id,
+                DailyNutritionSummary.date == day,
+                DailyNutritionSummary.meal_count <= 0
+            )
+        )
+
+def get_day_summary(db: Session, user_id: int, day: date) -> Optional[DailyNutritionSummary]:
+    """Get a user's totals for one day, or None if nothing was logged."""
+    return (
+        db.query(DailyNutritionSummary)
+        .filter(DailyNutritionSummary.user_id == user_id, DailyNutritionSummary.date == day)
+        .first()
+    )
+
+def get_summaries_between(db: Session, user_id: int, start: date, end: date) -> List[DailyNutritionSummary]:
+    """Get a user's daily totals with `start <= date < end`, oldest first."""
+    return (
+        db.query(DailyNutritionSummary)
+        .filter(
+            DailyNutritionSummary.user_id == user_id,
+            DailyNutritionSummary.date >= start,
+            DailyNutritionSummary.date < end
+        )
+        .order_by(DailyNutritionSummary.date)
+        .all()
+    )
+
+def get_period_totals(db: Session, user_id: int, start: date, end: date) -> Dict[str, float]:
+    """Sum a user's daily totals with `start <= date < end`."""
+    columns = NUTRIENTS + ("meal_count",)
+    row = db.execute(
+        select(*(func.coalesce(func.sum(getattr(DailyNutritionSummary, c)), 0) for c in columns))
+        .where(
+            DailyNutritionSummary.user_id == user_id,
+            DailyNutritionSummary.date >= start,
+            DailyNutritionSummary.date < end
+        )
+    ).one()
+    totals = {nutrient: float(value) for nutrient, value in zip(NUTRIENTS, row)}
+    totals["meal_count"] = int(row[-1])
+    return totals
+
+def rebuild_summaries(db: Session, user_id: Optional[int] = None) -> int:
+    """Recompute the summary rows from the meal logs; returns the number of days written."""
+    day = func.date(MealLog.date)
+    aggregate = (
+        select(
+            MealLog.user_id,
+            day,
+            *(func.coalesce(func.sum(getattr(MealComponent, n)), 0.0) for n in NUTRIENTS),
+            func.count(func.distinct(MealLog.id)),
+            literal(datetime.utcnow(), DateTime)
+        )
+        .select_from(MealLog)
+        .outerjoin(MealComponent, MealComponent.meal_log_id == MealLog.id)
+        .group_by(MealLog.user_id, day)
+    )
+    clear = delete(DailyNutritionSummary)
+    if user_id is not None:
+        aggregate = aggregate.where(MealLog.user_id == user_id)
+        clear = clear.where(DailyNutritionSummary.user_id == user_id)
+
+    columns = ["user_id", "date", *NUTRIENTS, "meal_count", "updated_at"]
+    try:
+        db.execute(clear)
+        written = db.execute(insert(DailyNutritionSummary).from_select(columns, aggregate)).rowcount
+        db.commit()
+        return written
+    except Exception:
+        db.rollback()
+        raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rebuild daily nutrition summaries from the meal logs.")
+    parser.add_argument("--user-id", type=int, help="only rebuild this user's days")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print(f"Rebuilt {rebuild_summaries(db, args.user_id)} daily summaries")
+    finally:
+        db.close()
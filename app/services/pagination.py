@@ -0,0 +1,71 @@
+"""Keyset (seek) pagination over `(date, id)`, newest first.
+
+A cursor encodes the `(date, id)` of the last row a client has seen, so
+every page is an index range scan from that position rather than an
+OFFSET that re-reads all earlier rows.
+"""
+import base64
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(date: datetime, row_id: int) -> str:
+    """Encode a row position as an opaque URL-safe cursor."""
+    raw = f"{date.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from `encode_cursor`; raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        date, row_id = raw.split("|")
+        return datetime.fromisoformat(date), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor {cursor!r}") from e
+
+def keyset_page(
+    query: Query,
+    date_column,
+    id_column,
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    serialize: Callable[[Any], Dict] = lambda row: row
+) -> Dict:
+    """
+    Fetch one page of `query`, newest first.
+
+    `before` returns rows older than that cursor (the next page), `after`
+    rows newer than it (the previous page). The result holds the
+    serialized `items` plus `next_cursor`/`prev_cursor`, which are None
+    when there is nothing further in that direction.
+    """
+    if before and after:
+        raise ValueError("Pass either before or after, not both")
+
+    if after:
+        date, row_id = decode_cursor(after)
+        query = query.filter(tuple_(date_column, id_column) > tuple_(date, row_id))
+        rows: List = query.order_by(date_column, id_column).limit(limit + 1).all()
+        has_more_newer = len(rows) > limit
+        rows = list(reversed(rows[:limit]))
+        has_more_older = True
+    else:
+        if before:
+            date, row_id = decode_cursor(before)
+            query = query.filter(tuple_(date_column, id_column) < tuple_(date, row_id))
+        rows = query.order_by(date_column.desc(), id_column.desc()).limit(limit + 1).all()
+        has_more_older = len(rows) > limit
+        rows = rows[:limit]
+        has_more_newer = before is not None
+
+    date_key, id_key = date_column.key, id_column.key
+    first, last = (rows[0], rows[-1]) if rows else (None, None)
+    return {
+        "items": [serialize(row) for row in rows],
+        "next_cursor": encode_cursor(getattr(last, date_key), getattr(last, id_key)) if rows and has_more_older else None,
+        "prev_cursor": encode_cursor(getattr(first, date_key), getattr(first, id_key)) if rows and has_more_newer else None
+    }
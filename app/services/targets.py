@@ -0,0 +1,214 @@
+"""Nutrition targets: BMI, TDEE, macro and water goals.
+
+These mirror `static/js/survey_calculations.js`, which fills in the
+survey form, so targets computed here match what a user was offered
+there: Mifflin-St Jeor BMR times an activity multiplier, split into
+macros by fitness goal. JavaScript's `Math.round` rounds halves up, so
+`_round` does the same rather than using Python's banker's rounding.
+
+Profiles do not record an activity level, so server-side calculations
+assume `DEFAULT_ACTIVITY_LEVEL` unless told otherwise. To recompute the
+stored goals of every profile, e.g. after a formula change:
+
+    python -m app.services.targets [--activity-level LEVEL]
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.enums import FitnessGoal, Gender
+from app.models.user import UserProfile
+
+ACTIVITY_MULTIPLIERS = {
+    "sedentary": 1.2,
+    "lightly_active": 1.375,
+    "moderately_active": 1.55,
+    "very_active": 1.725,
+    "extremely_active": 1.9
+}
+WATER_MULTIPLIERS = {
+    "sedentary": 1.0,
+    "lightly_active": 1.1,
+    "moderately_active": 1.2,
+    "very_active": 1.3,
+    "extremely_active": 1.4
+}
+DEFAULT_ACTIVITY_LEVEL = "moderately_active"
+
+# Share of calories as (protein, carbs, fat)
+MACRO_RATIOS = {
+    "weight_loss": (0.40, 0.25, 0.35),
+    "muscle_gain": (0.30, 0.50, 0.20),
+    "maintenance": (0.30, 0.40, 0.30),
+    "general_fitness": (0.25, 0.50, 0.25),
+    "athletic_performance": (0.30, 0.50, 0.20)
+}
+# The survey's fitness goals, by the ratio set the form applies to them
+GOAL_RATIOS = {
+    FitnessGoal.WEIGHT_LOSS: "weight_loss",
+    FitnessGoal.WEIGHT_MAINTENANCE: "maintenance",
+    FitnessGoal.MUSCLE_GAIN: "muscle_gain",
+    FitnessGoal.GENERAL_HEALTH: "general_fitness",
+    FitnessGoal.ATHLETIC_PERFORMANCE: "athletic_performance",
+    FitnessGoal.REHABILITATION: "general_fitness",
+    FitnessGoal.STRESS_MANAGEMENT: "general_fitness"
+}
+KCAL_PER_GRAM = np.array([4.0, 4.0, 9.0])  # protein, carbs, fat
+
+
+class Targets(NamedTuple):
+    daily_calorie_goal: int
+    protein_goal: int
+    carbs_goal: int
+    fat_goal: int
+    water_goal: float
+
+
+def _round(value, decimals: int = 0):
+    """Round halves up like JavaScript's `Math.round`; works on scalars and arrays."""
+    scale = 10 ** decimals
+    return np.floor(np.asarray(value) * scale + 0.5) / scale
+
+def _check_activity_level(activity_level: str) -> None:
+    if activity_level not in ACTIVITY_MULTIPLIERS:
+        raise ValueError(f"Unknown activity level {activity_level!r}; expected one of {', '.join(ACTIVITY_MULTIPLIERS)}")
+
+def calculate_bmi(weight: float, height: float) -> float:
+    """BMI from weight in kg and height in cm, to one decimal."""
+    meters = height / 100
+    return float(_round(weight / (meters * meters), 1))
+
+def calculate_tdee(weight: float, height: float, age: int, gender: Gender, activity_level: str) -> int:
+    """Daily energy expenditure in kcal (Mifflin-St Jeor BMR times activity)."""
+    _check_activity_level(activity_level)
+    bmr = 10 * weight + 6.25 * height - 5 * age + (5 if gender == Gender.MALE else -161)
+    return int(_round(bmr * ACTIVITY_MULTIPLIERS[activity_level]))
+
+def calculate_macros(calories: float, fitness_goal: FitnessGoal) -> Dict[str, int]:
+    """Grams of protein, carbs and fat for a calorie target."""
+    grams = _round(calories * np.array(MACRO_RATIOS[GOAL_RATIOS[fitness_goal]]) / KCAL_PER_GRAM)
+    return dict(zip(("protein", "carbs", "fat"), (int(g) for g in grams)))
+
+def calculate_water_goal(weight: float, activity_level: str) -> float:
+    """Daily water in liters, to one decimal."""
+    _check_activity_level(activity_level)
+    return float(_round(weight * 0.033 * WATER_MULTIPLIERS[activity_level], 1))
+
+@lru_cache(maxsize=4096)
+def nutrition_targets(
+    weight: float,
+    height: float,
+    age: int,
+    gender: Gender,
+    fitness_goal: FitnessGoal,
+    activity_level: str = DEFAULT_ACTIVITY_LEVEL
+) -> Targets:
+    """All daily targets for one set of body measurements and goals."""
+    calories = calculate_tdee(weight, height, age, gender, activity_level)
+    macros = calculate_macros(calories, fitness_goal)
+    return Targets(calories, macros["protein"], macros["carbs"], macros["fat"], calculate_water_goal(weight, activity_level))
+
+def get_profile_targets(db: Session, user_id: int, activity_level: str = DEFAULT_ACTIVITY_LEVEL) -> Optional[Dict]:
+    """Computed targets next to the goals stored on a user's profile; None without a profile."""
+    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+    if not profile:
+        return None
+    targets = nutrition_targets(
+        profile.weight, profile.height, profile.age, profile.gender, profile.fitness_goal, activity_level
+    )
+    return {
+        "activity_level": activity_level,
+        "bmi": calculate_bmi(profile.weight, profile.height),
+        "recommended": targets._asdict(),
+        "current": {name: getattr(profile, name) for name in Targets._fields}
+    }
+
+def targets_for_arrays(
+    weight: np.ndarray,
+    height: np.ndarray,
+    age: np.ndarray,
+    is_male: np.ndarray,
+    macro_ratios: np.ndarray,
+    activity_level: str = DEFAULT_ACTIVITY_LEVEL
+) -> Dict[str, np.ndarray]:
+    """`nutrition_targets` over parallel arrays; `macro_ratios` is rows x (protein, carbs, fat)."""
+    _check_activity_level(activity_level)
+    bmr = 10 * weight + 6.25 * height - 5 * age + np.where(is_male, 5, -161)
+    calories = _round(bmr * ACTIVITY_MULTIPLIERS[activity_level])
+    grams = _round(calories[:, None] * macro_ratios / KCAL_PER_GRAM)
+    return {
+        "daily_calorie_goal": calories.astype(int),
+        "protein_goal": grams[:, 0].astype(int),
+        "carbs_goal": grams[:, 1].astype(int),
+        "fat_goal": grams[:, 2].astype(int),
+        "water_goal": _round(weight * 0.033 * WATER_MULTIPLIERS[activity_level], 1)
+    }
+
+def recompute_profile_targets(
+    db: Session,
+    activity_level: str = DEFAULT_ACTIVITY_LEVEL,
+    chunk_size: int = 1000
+) -> int:
+    """Overwrite every profile's goals with computed targets, a chunk per transaction; returns profiles updated."""
+    _check_activity_level(activity_level)
+    ratio_table = np.array([MACRO_RATIOS[GOAL_RATIOS[goal]] for goal in FitnessGoal])
+    goal_index = {goal: i for i, goal in enumerate(FitnessGoal)}
+    updated = 0
+    after_id = 0
+    while True:
+        rows = db.execute(
+            select(
+                UserProfile.id, UserProfile.weight, UserProfile.height, UserProfile.age,
+                UserProfile.gender, UserProfile.fitness_goal
+            )
+            .where(UserProfile.id > after_id)
+            .order_by(UserProfile.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return updated
+
+        ids, weights, heights, ages, genders, goals = zip(*rows)
+        targets = targets_for_arrays(
+            np.array(weights, dtype=float),
+            np.array(heights, dtype=float),
+            np.array(ages, dtype=float),
+            np.array([gender == Gender.MALE for gender in genders]),
+            ratio_table[[goal_index[goal] for goal in goals]],
+            activity_level
+        )
+        now = datetime.utcnow()
+        columns = {name: values.tolist() for name, values in targets.items()}
+        values = [
+            {"id": profile_id, "updated_at": now, **{name: column[i] for name, column in columns.items()}}
+            for i, profile_id in enumerate(ids)
+        ]
+        try:
+            db.execute(update(UserProfile), values)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        updated += len(values)
+        after_id = ids[-1]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Recompute every profile's nutrition goals.")
+    parser.add_argument("--activity-level", default=DEFAULT_ACTIVITY_LEVEL, choices=list(ACTIVITY_MULTIPLIERS))
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print(f"Recomputed targets for {recompute_profile_targets(db, args.activity_level, args.chunk_size)} profiles")
+    finally:
+        db.close()
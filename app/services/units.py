@@ -0,0 +1,180 @@
+"""Quantity normalization: every `MealComponent.quantity` expressed in grams.
+
+Mass units convert by a constant. Cups, pieces and servings depend on
+the food, so they go through a portion table (grams per cup, per piece
+and per serving) keyed by food name, falling back to the component's
+category. Liquids are normalized by mass too, through their density, so
+"1 cup of milk" becomes 244 g.
+
+Conversions run over whole arrays of components with numpy: each distinct
+food is looked up once, then the per-row factors are gathered by index.
+The normalized value is stored in `MealComponent.quantity_grams`; rows
+written before it existed are filled by
+
+    python -m app.services.units
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.meal import MealComponent, FoodCategory, UnitType
+from app.services.foods import normalize
+
+OUNCE_GRAMS = 28.349523125
+MASS_FACTORS = {UnitType.GRAMS.value: 1.0, UnitType.OUNCES.value: OUNCE_GRAMS}
+# Column of each portion unit in a (per cup, per piece, per serving) row
+PORTION_COLUMNS = {UnitType.CUPS.value: 0, UnitType.PIECES.value: 1, UnitType.SERVINGS.value: 2}
+
+# Grams per (cup, piece, serving) when nothing more specific is known
+CATEGORY_PORTIONS: Dict[str, Tuple[float, float, float]] = {
+    FoodCategory.PROTEIN.value: (140.0, 50.0, 85.0),
+    FoodCategory.CARB.value: (158.0, 40.0, 50.0),
+    FoodCategory.VEGETABLE.value: (90.0, 120.0, 85.0),
+    FoodCategory.FRUIT.value: (150.0, 150.0, 120.0),
+    FoodCategory.DAIRY.value: (245.0, 28.0, 30.0),
+    FoodCategory.FAT.value: (218.0, 10.0, 14.0),
+    FoodCategory.OTHER.value: (240.0, 30.0, 30.0),
+}
+
+# Per-food overrides, keyed by normalized name; None keeps the category value
+FOOD_PORTIONS: Dict[str, Tuple[Optional[float], Optional[float], Optional[float]]] = {
+    "egg": (243.0, 50.0, 50.0),
+    "egg white": (243.0, 33.0, 33.0),
+    "banana": (150.0, 118.0, 118.0),
+    "apple": (125.0, 182.0, 182.0),
+    "orange": (180.0, 131.0, 131.0),
+    "blueberries": (148.0, 1.5, 148.0),
+    "strawberries": (152.0, 12.0, 152.0),
+    "grapes": (151.0, 5.0, 151.0),
+    "avocado": (150.0, 200.0, 50.0),
+    "bread": (None, 28.0, 28.0),
+    "bread whole wheat": (None, 32.0, 32.0),
+    "bagel": (None, 105.0, 105.0),
+    "tortilla flour": (None, 45.0, 45.0),
+    "oats rolled": (81.0, None, 40.0),
+    "rice white cooked": (158.0, None, 158.0),
+    "rice brown cooked": (195.0, None, 195.0),
+    "pasta cooked": (140.0, None, 140.0),
+    "milk": (244.0, None, 244.0),
+    "milk whole": (244.0, None, 244.0),
+    "milk skim": (245.0, None, 245.0),
+    "orange juice": (248.0, None, 248.0),
+    "greek yogurt plain nonfat": (227.0, 170.0, 170.0),
+    "cheese cheddar": (113.0, 28.0, 28.0),
+    "whey protein powder": (120.0, None, 30.0),
+    "butter salted": (227.0, 14.0, 14.0),
+    "olive oil": (216.0, None, 13.5),
+    "peanut butter": (258.0, None, 32.0),
+    "honey": (339.0, None, 21.0),
+    "almonds": (143.0, 1.2, 28.0),
+    "walnuts": (117.0, 4.0, 28.0),
+}
+
+
+def _value(member) -> str:
+    return member.value if hasattr(member, "value") else str(member).lower()
+
+@lru_cache(maxsize=4096)
+def portion_grams(food_item: str, category: str) -> Tuple[float, float, float]:
+    """Grams per cup, piece and serving of a food."""
+    portions = list(CATEGORY_PORTIONS.get(category, CATEGORY_PORTIONS[FoodCategory.OTHER.value]))
+    # Most specific match first: "milk whole organic" -> "milk whole" -> "milk"
+    words = normalize(food_item or "").split()
+    for end in range(len(words), 0, -1):
+        override = FOOD_PORTIONS.get(" ".join(words[:end]))
+        if override:
+            return tuple(o if o is not None else p for o, p in zip(override, portions))
+    return tuple(portions)
+
+def to_grams(
+    quantities: Sequence[float],
+    units: Sequence,
+    categories: Sequence,
+    food_items: Sequence[str]
+) -> np.ndarray:
+    """Convert parallel arrays of component quantities to grams (NaN where unknown)."""
+    quantities = np.asarray(quantities, dtype=float)
+    units = np.array([_value(unit) for unit in units], dtype=object)
+    factors = np.full(len(quantities), np.nan)
+
+    for unit, factor in MASS_FACTORS.items():
+        factors[units == unit] = factor
+
+    portion_rows = np.flatnonzero(np.isin(units, list(PORTION_COLUMNS)))
+    if portion_rows.size:
+        keys = [(food_items[i] or "", _value(categories[i])) for i in portion_rows]
+        unique_keys = sorted(set(keys))
+        position = {key: n for n, key in enumerate(unique_keys)}
+        table = np.array([portion_grams(*key) for key in unique_keys])
+        rows = np.fromiter((position[key] for key in keys), dtype=np.intp, count=len(keys))
+        columns = np.fromiter((PORTION_COLUMNS[u] for u in units[portion_rows]), dtype=np.intp, count=len(keys))
+        factors[portion_rows] = table[rows, columns]
+
+    return quantities * factors
+
+def component_grams(components: Sequence[Dict]) -> List[Optional[float]]:
+    """Grams for a list of component dicts, in order."""
+    if not components:
+        return []
+    grams = to_grams(
+        [c.get("quantity") or 0 for c in components],
+        [c.get("unit") for c in components],
+        [c.get("category") for c in components],
+        [c.get("food_item") for c in components]
+    )
+    return [None if np.isnan(g) else round(float(g), 3) for g in grams]
+
+def with_grams(components: Iterable[Dict]) -> List[Dict]:
+    """Copy component dicts with `quantity_grams` filled in."""
+    components = list(components)
+    return [
+        {**component, "quantity_grams": grams}
+        for component, grams in zip(components, component_grams(components))
+    ]
+
+def backfill_quantity_grams(db: Session, batch_size: int = 1000) -> int:
+    """Fill `quantity_grams` where it is missing, in keyset batches; returns rows updated."""
+    updated = 0
+    after_id = 0
+    while True:
+        rows = db.execute(
+            MealComponent.__table__.select()
+            .with_only_columns(
+                MealComponent.id, MealComponent.quantity, MealComponent.unit,
+                MealComponent.category, MealComponent.food_item
+            )
+            .where(MealComponent.quantity_grams.is_(None), MealComponent.id > after_id)
+            .order_by(MealComponent.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return updated
+
+        ids, quantities, units, categories, food_items = zip(*rows)
+        grams = to_grams(quantities, units, categories, food_items)
+        values = [
+            {"id": row_id, "quantity_grams": round(float(g), 3)}
+            for row_id, g in zip(ids, grams) if not np.isnan(g)
+        ]
+        try:
+            if values:
+                db.execute(update(MealComponent), values)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        updated += len(values)
+        after_id = ids[-1]
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(f"Normalized {backfill_quantity_grams(db)} meal components")
+    finally:
+        db.close()
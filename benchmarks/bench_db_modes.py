@@ -0,0 +1,129 @@
+"""
+Compare the sync and async database modes on the same workload.
+
+Each mode runs in its own interpreter, against its own throwaway SQLite
+file, and fires concurrent requests at the meal and knowledge-base routes
+through the ASGI app in-process.
+
+Keep the concurrency below the sync pool's capacity (pool_size +
+max_overflow): past that, a sync request waiting for a connection blocks
+the event loop that would release one.
+
+Usage:
+    python benchmarks/bench_db_modes.py [--requests 400] [--concurrency 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def seed(session_factory, meals_per_day=4, days=60):
+    from app.core.security import get_password_hash
+    from app.models import User, MealLog, MealComponent, KnowledgeCategory
+    from app.models.meal import MealType, FoodCategory, UnitType
+
+    db = session_factory()
+    user = User(email="bench@example.com", username="bench",
+                hashed_password=get_password_hash("Bench123!@#"), is_active=True)
+    db.add(user)
+    db.add(KnowledgeCategory(title="Bench", description="Bench", content="<p>bench</p>"))
+    db.flush()
+    start = datetime(2024, 1, 1, 8, 0)
+    for day in range(days):
+        for n in range(meals_per_day):
+            meal = MealLog(user_id=user.id, date=start + timedelta(days=day, hours=3 * n),
+                           meal_type=list(MealType)[n % 4])
+            db.add(meal)
+            db.flush()
+            for _ in range(3):
+                db.add(MealComponent(meal_log_id=meal.id, food_item="rice", category=FoodCategory.CARB,
+                                     quantity=100, unit=UnitType.GRAMS, calories=130,
+                                     protein=2.7, carbs=28, fat=0.3))
+    db.commit()
+    db.close()
+
+
+async def run_load(total, concurrency):
+    import httpx
+    from app.main import app
+
+    paths = ["/meal-tracker/view/2024-01-15", "/meal-tracker/2024/1", "/knowledge-base/1"]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/login", data={"email": "bench@example.com", "password": "Bench123!@#"})
+        client.cookies = response.cookies
+        latencies = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(i):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(paths[i % len(paths)])
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def child(args):
+    from sqlalchemy.orm import sessionmaker
+    from app.db.session import engine
+    from app.db.base_class import Base
+    import app.models  # noqa: register all tables
+
+    Base.metadata.create_all(bind=engine)
+    seed(sessionmaker(bind=engine))
+    result = asyncio.run(run_load(args.requests, args.concurrency))
+    result["mode"] = "async" if os.environ["DB_ASYNC_MODE"] == "true" else "sync"
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args)
+
+    for mode in ("false", "true"):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                DB_ASYNC_MODE=mode,
+                DB_ECHO_LOG="false",
+                SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp}/bench.db",
+                PYTHONPATH=str(ROOT),
+            )
+            out = subprocess.run(
+                [sys.executable, __file__, "--child",
+                 "--requests", str(args.requests), "--concurrency", str(args.concurrency)],
+                env=env, cwd=ROOT, check=True, capture_output=True, text=True
+            )
+            print(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    main()
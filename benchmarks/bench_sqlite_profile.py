@@ -0,0 +1,125 @@
+"""
+Measure concurrent SQLite write and read throughput with and without the
+SQLite performance profile from `app.db.sqlite`.
+
+Writer threads insert meals with components and knowledge-base comments,
+one transaction each (like `add_meal` and `add_comment`), while reader
+threads run day-view queries against a day seeded before the run. Writes
+land on later days, so every read does the same work however fast the
+writers go. Each run uses a fresh database file.
+
+Usage:
+    python benchmarks/bench_sqlite_profile.py [--seconds 5] [--writers 4] [--readers 4]
+"""
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.base import Base, User, KnowledgeCategory, Comment  # noqa: E402
+from app.db.sqlite import apply_sqlite_profile  # noqa: E402
+from app.models.meal import MealType, FoodCategory, UnitType  # noqa: E402
+from app.services import meals as meal_service  # noqa: E402
+
+
+# Meals on the day the readers query
+SEEDED_MEALS = 20
+COMPONENT = {"food_item": "Rice", "category": FoodCategory.CARB, "quantity": 100,
+             "unit": UnitType.GRAMS, "calories": 130, "protein": 2.7, "carbs": 28, "fat": 0.3}
+
+
+def run(path, tuned, seconds, writers, readers):
+    settings.SQLITE_TUNING_ENABLED = tuned
+    engine = create_engine(f"sqlite:///{path}", pool_size=writers + readers)
+    apply_sqlite_profile(engine)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    with Session() as db:
+        user = User(email="bench@example.com", username="bench", hashed_password="x", is_active=True)
+        db.add(user)
+        db.add(KnowledgeCategory(title="Bench", description="Bench", content="<p>bench</p>"))
+        db.commit()
+        user_id = user.id
+        for i in range(SEEDED_MEALS):
+            meal_service.create_meal(db, user_id, datetime(2024, 1, 1, 0, i), MealType.LUNCH, None, [COMPONENT])
+
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    read_day = datetime(2024, 1, 1)
+    write_start = read_day + timedelta(days=1)
+
+    def writer(n):
+        i = 0
+        while time.perf_counter() < deadline:
+            db = Session()
+            try:
+                meal_service.create_meal(
+                    db, user_id, write_start + timedelta(minutes=n * 100000 + i), MealType.LUNCH, None, [COMPONENT]
+                )
+                db.add(Comment(category_id=1, user_id=user_id, content="bench"))
+                db.commit()
+                with lock:
+                    counts["writes"] += 2
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    counts["locked"] += 1
+            finally:
+                db.close()
+            i += 1
+
+    def reader():
+        while time.perf_counter() < deadline:
+            db = Session()
+            try:
+                meal_service.get_meals_between(db, user_id, read_day, read_day + timedelta(days=1))
+                with lock:
+                    counts["reads"] += 1
+            except OperationalError:
+                with lock:
+                    counts["locked"] += 1
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    print(
+        f"{'tuned' if tuned else 'default':>8}: "
+        f"{counts['writes'] / seconds:9.1f} writes/s  "
+        f"{counts['reads'] / seconds:9.1f} reads/s  "
+        f"{counts['locked']:5d} 'database is locked' errors"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    for tuned in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            run(Path(tmp) / "bench.db", tuned, args.seconds, args.writers, args.readers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import csv
+import sys
+
+from app.db.session import SessionLocal
+from app.services.foods import load_foods
+
+def init_food_catalog(path="data/foods.csv"):
+    db = SessionLocal()
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            count = load_foods(db, csv.DictReader(f))
+        print(f"Loaded {count} foods into the catalog")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    init_food_catalog(*sys.argv[1:2])
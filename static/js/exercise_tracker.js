@@ -46,8 +46,8 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
-    // Function to add exercise to table
-    function addExerciseToTable(exercise) {
+    // Function to add exercise to table (new entries go on top, history pages below)
+    function addExerciseToTable(exercise, append = false) {
         const row = document.createElement('tr');
         row.innerHTML = `
             <td class="py-3 px-6">${new Date(exercise.date).toLocaleDateString()}</td>
@@ -59,18 +59,35 @@ document.addEventListener('DOMContentLoaded', () => {
                 <button class="text-red-500 hover:text-red-700">Delete</button>
             </td>
         `;
-        exerciseLogBody.prepend(row);
+        if (append) {
+            exerciseLogBody.append(row);
+        } else {
+            exerciseLogBody.prepend(row);
+        }
     }
 
-    // Fetch existing exercise logs on page load
-    async function fetchExerciseLogs() {
+    // Fetch existing exercise logs a page at a time, newest first
+    let nextCursor = null;
+    const loadMoreBtn = document.createElement('button');
+    loadMoreBtn.textContent = 'Load more';
+    loadMoreBtn.className = 'mt-4 text-blue-500 hover:text-blue-700 hidden';
+    loadMoreBtn.addEventListener('click', () => fetchExerciseLogs(nextCursor));
+    exerciseLogBody.closest('table')?.after(loadMoreBtn);
+
+    async function fetchExerciseLogs(before = null) {
         try {
-            const response = await fetch('/api/exercise-logs');
+            const params = new URLSearchParams({ limit: 50 });
+            if (before) {
+                params.set('before', before);
+            }
+            const response = await fetch(`/api/exercise-logs?${params}`);
             if (!response.ok) {
                 throw new Error('Failed to fetch exercise logs');
             }
-            const exercises = await response.json();
-            exercises.forEach(addExerciseToTable);
+            const page = await response.json();
+            page.items.forEach(exercise => addExerciseToTable(exercise, true));
+            nextCursor = page.next_cursor;
+            loadMoreBtn.classList.toggle('hidden', !nextCursor);
         } catch (error) {
             console.error('Error:', error);
         }
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -5,8 +7,12 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db.base import Base
+from app.db.base import Base, User, UserProfile
 from app.db.session import get_db
+from app.core.enums import Gender, FitnessGoal, TimePreference
+from app.core.identity_cache import identity_cache
+from app.core.http_cache import render_cache
+from app.core.security import get_password_hash
 
 # Create test database
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite://"  # in-memory database
@@ -42,8 +48,52 @@ def client(test_db):
             test_db.close()
     
     app.dependency_overrides[get_db] = override_get_db
+    identity_cache.clear()
+    render_cache.clear()
     
     with TestClient(app) as test_client:
         yield test_client
     
     app.dependency_overrides.clear()
+    identity_cache.clear()
+
+TEST_PASSWORD = "Test123!@#"
+
+@lru_cache(maxsize=None)
+def _test_password_hash():
+    # Hashing is deliberately slow; every test user shares the one hash
+    return get_password_hash(TEST_PASSWORD)
+
+def add_user(db, email="test@example.com", username="testuser", **fields):
+    """Add an active user who can log in with TEST_PASSWORD; returned with its columns loaded."""
+    user = User(email=email, username=username, hashed_password=_test_password_hash(), is_active=True, **fields)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+def add_profile(db, user_id, **fields):
+    """Add a completed survey profile for a user; `fields` override the defaults."""
+    values = dict(
+        age=30, gender=Gender.MALE, height=180, weight=80, target_weight=75,
+        fitness_goal=FitnessGoal.GENERAL_HEALTH, time_preference=TimePreference.MORNING, exercise_types=[],
+        daily_calorie_goal=2500, protein_goal=150, carbs_goal=300, fat_goal=70, water_goal=3.0,
+        sleep_hours=8, stress_level=2, meal_frequency=3
+    )
+    values.update(fields)
+    db.add(UserProfile(user_id=user_id, **values))
+    db.commit()
+
+def log_in(client, email="test@example.com"):
+    response = client.post("/login", data={"email": email, "password": TEST_PASSWORD}, follow_redirects=False)
+    assert response.status_code == 303
+    return response
+
+@pytest.fixture
+def user(test_db):
+    return add_user(test_db)
+
+@pytest.fixture
+def logged_in_client(client, user):
+    log_in(client, user.email)
+    return client
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.session import run_db
+from app.models.meal import MealType, FoodCategory, UnitType
+from app.services import meals as meal_service
+from tests.conftest import add_user
+
+
+@pytest_asyncio.fixture
+async def async_db():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        yield db
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_services_run_on_async_session(async_db):
+    assert isinstance(async_db, AsyncSession)
+    user_id = (await run_db(async_db, add_user)).id
+    
+    meal_date = datetime(2024, 1, 15, 12, 30)
+    components = [{
+        "food_item": "Rice",
+        "category": FoodCategory.CARB,
+        "quantity": 100,
+        "unit": UnitType.GRAMS,
+        "calories": 130,
+        "protein": 2.7,
+        "carbs": 28,
+        "fat": 0.3
+    }]
+    meal_id = await run_db(async_db, meal_service.create_meal, user_id, meal_date, MealType.LUNCH, None, components)
+    
+    meals = await run_db(
+        async_db, meal_service.get_meals_between,
+        user_id, datetime(2024, 1, 15), datetime(2024, 1, 15) + timedelta(days=1)
+    )
+    
+    # Components were loaded eagerly, so reading them needs no further I/O
+    assert [meal.id for meal in meals] == [meal_id]
+    assert meals[0].components[0].food_item == "Rice"
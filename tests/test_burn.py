@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import pytest
+
+from app.db.base import ExerciseLog, ExerciseComponent
+from app.models.exercise import ExerciseType, ExerciseCategory, ExerciseIntensity
+from app.services import burn
+from tests.conftest import add_profile
+
+
+@pytest.fixture
+def user(user, test_db):
+    """The shared test user, weighing 80 kg."""
+    add_profile(test_db, user.id, weight=80)
+    return user
+
+def test_estimate_burn_uses_category_then_type():
+    # 60 minutes of medium cardio at 70 kg: 7.0 MET * 3.5 * 70 / 200 * 60
+    assert burn.estimate_burn(ExerciseType.CARDIO, ExerciseIntensity.MEDIUM, 60, 70) == (514, [])
+    # Half running, half "other" (no category MET, so the cardio MET)
+    total, parts = burn.estimate_burn(
+        ExerciseType.CARDIO, ExerciseIntensity.MEDIUM, 60, 70, [ExerciseCategory.RUNNING, ExerciseCategory.OTHER]
+    )
+    assert parts == [360, 257] and total == 617
+
+def test_logging_exercise_stores_burn(logged_in_client, test_db):
+    response = logged_in_client.post("/api/exercise-log", json={
+        "exercise_type": "strength", "intensity": "high", "duration": 45,
+        "components": [{"exercise_name": "Squat", "category": "weight_training", "sets": 5, "reps": 5}]
+    })
+    assert response.status_code == 200
+    # 6.0 MET * 3.5 * 80 kg / 200 * 45 minutes
+    assert response.json()["total_calories_burned"] == 378
+    assert test_db.query(ExerciseComponent).one().calories_burned == 378
+
+def test_backfill_fills_missing_estimates(test_db, user):
+    test_db.add(ExerciseLog(
+        user_id=user.id, date=datetime(2024, 1, 1), exercise_type=ExerciseType.FLEXIBILITY,
+        duration=60, intensity=ExerciseIntensity.LOW,
+        components=[ExerciseComponent(exercise_name="Flow", category=ExerciseCategory.YOGA)]
+    ))
+    test_db.add(ExerciseLog(
+        user_id=user.id, date=datetime(2024, 1, 2), exercise_type=ExerciseType.HIIT,
+        duration=20, intensity=ExerciseIntensity.HIGH, total_calories_burned=999
+    ))
+    test_db.commit()
+
+    assert burn.backfill_burn(test_db, chunk_size=1) == 1
+    test_db.expire_all()
+    yoga, hiit = test_db.query(ExerciseLog).order_by(ExerciseLog.id)
+    assert yoga.total_calories_burned == yoga.components[0].calories_burned == 210
+    assert hiit.total_calories_burned == 999
+
+    assert burn.backfill_burn(test_db, recompute=True) == 2
+    test_db.expire_all()
+    assert test_db.get(ExerciseLog, hiit.id).total_calories_burned == 280
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.knowledge import KnowledgeCategory, Comment, CommentLike
+from app.services import knowledge as knowledge_service
+from tests.conftest import add_user, log_in
+
+
+def add_comments(db, count=2):
+    users = [add_user(db, email=f"user{n}@example.com", username=f"user{n}") for n in range(3)]
+    category = KnowledgeCategory(title="Protein", description="How much?", content="<p>Plenty.</p>")
+    db.add(category)
+    db.flush()
+    comments = [
+        Comment(category_id=category.id, user_id=users[0].id, content=f"Comment {n}", likes=0,
+                created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1))
+        for n in range(count)
+    ]
+    db.add_all(comments)
+    db.commit()
+    return [user.id for user in users], [comment.id for comment in comments]
+
+def likes_of(db, comment_id):
+    db.expire_all()
+    return db.get(Comment, comment_id).likes
+
+def test_like_once_per_user(client, test_db):
+    (first, second, _), (comment_id, _) = add_comments(test_db)
+    log_in(client, "user1@example.com")
+
+    for _ in range(3):
+        response = client.post(f"/knowledge-base/comments/{comment_id}/like", follow_redirects=False)
+        assert response.status_code == 303
+    assert likes_of(test_db, comment_id) == 1
+
+    knowledge_service.like_comment(test_db, comment_id, first)
+    assert likes_of(test_db, comment_id) == 2
+    assert test_db.query(CommentLike).count() == 2
+    assert client.post("/knowledge-base/comments/999/like", follow_redirects=False).status_code == 404
+
+def test_buffered_likes_flush_as_one_batch(test_db, monkeypatch):
+    monkeypatch.setattr(settings, "COMMENT_LIKES_BUFFERED", True)
+    users, (popular, other) = add_comments(test_db)
+    buffer = knowledge_service.LikeBuffer()
+    monkeypatch.setattr(knowledge_service, "like_buffer", buffer)
+
+    for user_id in users + users:
+        knowledge_service.like_comment(test_db, popular, user_id)
+    knowledge_service.like_comment(test_db, other, users[0])
+    assert likes_of(test_db, popular) == 0 and len(buffer) == 4
+
+    writes = []
+    engine = test_db.get_bind()
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("SELECT"):
+            writes.append(statement.split()[0].upper())
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        assert buffer.flush(test_db) == 4
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert writes == ["INSERT", "UPDATE"]
+    assert likes_of(test_db, popular) == 3 and likes_of(test_db, other) == 1
+    assert len(buffer) == 0
+
+    # Repeats across flushes are still ignored
+    knowledge_service.like_comment(test_db, popular, users[0])
+    assert buffer.flush(test_db) == 0
+    assert likes_of(test_db, popular) == 3
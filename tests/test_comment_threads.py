@@ -0,0 +1,60 @@
+import re
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.knowledge import KnowledgeCategory, Comment
+from app.services import knowledge as knowledge_service
+from tests.conftest import add_user, log_in
+
+
+def setup_thread(client, test_db, comments):
+    users = [add_user(test_db, email=f"user{n}@example.com", username=f"user{n}") for n in range(3)]
+    category = KnowledgeCategory(title="Protein", description="How much?", content="<p>Plenty.</p>")
+    test_db.add(category)
+    test_db.flush()
+    start = datetime(2024, 1, 1)
+    test_db.add_all(
+        Comment(category_id=category.id, user_id=users[n % 3].id, content=f"Comment {n}", likes=0,
+                created_at=start + timedelta(minutes=n), updated_at=start + timedelta(minutes=n))
+        for n in range(comments)
+    )
+    category.comment_count = comments
+    test_db.commit()
+    category_id = category.id
+    log_in(client, "user0@example.com")
+    return category_id
+
+def test_article_page_cost_is_flat(client, test_db):
+    small = setup_thread(client, test_db, 2)
+    client.get("/knowledge-base")  # warm the identity cache
+    few = client.get(f"/knowledge-base/{small}")
+
+    for n in range(2, 60):
+        test_db.add(Comment(category_id=small, user_id=1 + n % 3, content=f"Comment {n}", likes=0,
+                            created_at=datetime(2024, 1, 2) + timedelta(minutes=n), updated_at=datetime(2024, 1, 2)))
+    test_db.query(KnowledgeCategory).update({"comment_count": 60})
+    test_db.commit()
+    large = client.get(f"/knowledge-base/{small}")
+
+    assert few.status_code == large.status_code == 200
+    assert few.headers["X-DB-Query-Count"] == large.headers["X-DB-Query-Count"]
+    assert len(re.findall(r"Comment \d+", large.text)) == settings.COMMENTS_PAGE_SIZE
+    assert "Comment 59" in large.text and "(60)" in large.text
+    assert "Older comments" in large.text and "Newer comments" not in large.text
+
+def test_comment_pages_and_count(client, test_db):
+    category_id = setup_thread(client, test_db, settings.COMMENTS_PAGE_SIZE + 5)
+
+    first = knowledge_service.get_comment_page(test_db, category_id, settings.COMMENTS_PAGE_SIZE)
+    second = knowledge_service.get_comment_page(test_db, category_id, settings.COMMENTS_PAGE_SIZE, before=first["next_cursor"])
+    assert [c.content for c in second["items"]] == [f"Comment {n}" for n in range(4, -1, -1)]
+    assert second["next_cursor"] is None
+
+    client.post(f"/knowledge-base/{category_id}/comments", data={"comment_text": "New"}, follow_redirects=False)
+    test_db.expire_all()
+    assert test_db.get(KnowledgeCategory, category_id).comment_count == settings.COMMENTS_PAGE_SIZE + 6
+
+    own = test_db.query(Comment).filter(Comment.content == "Comment 0").one()
+    client.post(f"/knowledge-base/comments/{own.id}/delete", follow_redirects=False)
+    test_db.expire_all()
+    assert test_db.get(KnowledgeCategory, category_id).comment_count == settings.COMMENTS_PAGE_SIZE + 5
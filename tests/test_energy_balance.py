@@ -0,0 +1,55 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.db.base import ExerciseLog, DailyNutritionSummary
+from app.models.exercise import ExerciseType, ExerciseIntensity
+from app.services import energy_balance
+from tests.conftest import add_profile
+
+
+@pytest.fixture
+def history(test_db, user):
+    """Goal, intake and exercise for the shared test user in early January 2024."""
+    add_profile(test_db, user.id, daily_calorie_goal=2000)
+    for day, calories in ((1, 2500), (2, 1800)):
+        test_db.add(DailyNutritionSummary(
+            user_id=user.id, date=date(2024, 1, day), calories=calories, protein=0, carbs=0, fat=0,
+            meal_count=1, updated_at=datetime.utcnow()
+        ))
+    for when, burned in ((datetime(2024, 1, 2, 7), 300), (datetime(2024, 1, 2, 23, 30), 100), (datetime(2024, 1, 3, 18), 400), (datetime(2024, 1, 4, 6), 999)):
+        test_db.add(ExerciseLog(
+            user_id=user.id, date=when, exercise_type=ExerciseType.CARDIO, duration=30,
+            intensity=ExerciseIntensity.MEDIUM, total_calories_burned=burned
+        ))
+    test_db.commit()
+
+def test_energy_balance_in_one_statement(test_db, user, history):
+    user_id = user.id
+
+    statements = []
+    engine = test_db.get_bind()
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        balance = energy_balance.get_energy_balance(test_db, user_id, date(2024, 1, 1), date(2024, 1, 4))
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert len(statements) == 1
+    assert balance["calorie_goal"] == 2000
+    assert [(d["date"], d["intake"], d["burned"], d["net"], d["goal_difference"]) for d in balance["days"]] == [
+        ("2024-01-01", 2500, 0, 2500, 500),
+        ("2024-01-02", 1800, 400, 1400, -600),
+        ("2024-01-03", 0, 400, -400, -2400),
+    ]
+
+def test_energy_balance_endpoint(history, logged_in_client):
+    client = logged_in_client
+    response = client.get("/api/energy-balance?from=2024-01-04&to=2024-01-05")
+    assert response.status_code == 200
+    assert [d["burned"] for d in response.json()["days"]] == [999, 0]
+    assert (response.json()["start"], response.json()["end"]) == ("2024-01-04", "2024-01-05")
+    assert client.get("/api/energy-balance?from=2024-01-05&to=2024-01-01").status_code == 400
@@ -0,0 +1,73 @@
+import json
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
+
+from app.core.config import settings
+from app.db.engine import create_db_engine, resolve_pool_class
+
+
+@pytest.fixture
+def db_settings(monkeypatch):
+    def apply(**values):
+        for name, value in values.items():
+            monkeypatch.setattr(settings, name, value)
+    return apply
+
+def test_auto_pool_class_by_backend(db_settings):
+    db_settings(DB_POOL_CLASS="auto")
+    assert resolve_pool_class("sqlite://") == "static"
+    assert resolve_pool_class("sqlite:///:memory:") == "static"
+    assert resolve_pool_class("sqlite:///./sql_app.db") == "queue"
+    assert resolve_pool_class("postgresql://u:p@db/app") == "queue"
+
+def test_pool_settings_applied(tmp_path, db_settings):
+    db_settings(DB_POOL_CLASS="auto", DB_POOL_SIZE=3, DB_MAX_OVERFLOW=2, DB_POOL_TIMEOUT=7.0)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 2
+    assert engine.pool._timeout == 7.0
+    engine.dispose()
+
+    assert isinstance(create_db_engine("sqlite://").pool, StaticPool)
+    db_settings(DB_POOL_CLASS="null")
+    assert isinstance(create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}").pool, NullPool)
+
+def test_unknown_pool_class_rejected(db_settings):
+    db_settings(DB_POOL_CLASS="bogus")
+    with pytest.raises(ValueError):
+        create_db_engine("sqlite://")
+
+def test_sampled_sql_logging(caplog, db_settings):
+    db_settings(DB_SQL_LOG_SAMPLE_RATE=1.0, DB_SQL_LOG_SLOW_MS=None)
+    engine = create_db_engine("sqlite://")
+    with caplog.at_level(logging.INFO, logger="app.sql"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    records = [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.sql"]
+    assert any(r["statement"] == "SELECT 1" and r["event"] == "sql" for r in records)
+
+def test_sql_logging_off_by_default(caplog):
+    engine = create_db_engine("sqlite://")
+    with caplog.at_level(logging.INFO, logger="app.sql"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    assert not [r for r in caplog.records if r.name == "app.sql"]
+
+def test_sql_logging_survives_failing_statements(caplog, db_settings):
+    db_settings(DB_SQL_LOG_SAMPLE_RATE=1.0, DB_SQL_LOG_SLOW_MS=None)
+    engine = create_db_engine("sqlite://")
+    with caplog.at_level(logging.INFO, logger="app.sql"):
+        with engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(Exception):
+                    conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 2"))
+            assert not [key for key in conn.connection.info if key.startswith("sql_log")]
+
+    records = [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.sql"]
+    assert [r["statement"] for r in records] == ["SELECT 2"]
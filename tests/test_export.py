@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.base import ExerciseLog, ExerciseComponent
+from app.models.exercise import ExerciseType, ExerciseIntensity, ExerciseCategory
+from app.models.meal import MealLog, MealType, FoodCategory, UnitType
+from app.services import meals as meal_service
+
+
+class RecordingSession(Session):
+    """Session that remembers being closed."""
+    closed = False
+
+    def close(self):
+        super().close()
+        self.closed = True
+
+@pytest.fixture
+def stream_sessions(test_db, monkeypatch):
+    """Sessions opened by streamed response bodies, bound to the test database."""
+    opened = []
+    factory = sessionmaker(bind=test_db.get_bind(), class_=RecordingSession)
+    def open_session():
+        opened.append(factory())
+        return opened[-1]
+    monkeypatch.setattr(db_session, "SessionLocal", open_session)
+    return opened
+
+@pytest.fixture
+def history_client(logged_in_client, test_db, user, stream_sessions, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    start = datetime(2024, 1, 1, 12)
+    for day in range(5):
+        meal_service.create_meal(test_db, user.id, start + timedelta(days=day), MealType.LUNCH, None, [
+            {"food_item": "Rice", "category": FoodCategory.CARB, "quantity": 100, "unit": UnitType.GRAMS,
+             "calories": 130, "protein": 2.7, "carbs": 28, "fat": 0.3},
+            {"food_item": "Beans", "category": FoodCategory.PROTEIN, "quantity": 100, "unit": UnitType.GRAMS,
+             "calories": 120, "protein": 8, "carbs": 20, "fat": 0.5}
+        ])
+    log = ExerciseLog(user_id=user.id, date=start, exercise_type=ExerciseType.CARDIO,
+                      duration=30, intensity=ExerciseIntensity.MEDIUM)
+    log.components.append(ExerciseComponent(exercise_name="Run", category=ExerciseCategory.RUNNING, distance=5))
+    test_db.add(log)
+    # No components, so nothing to export
+    test_db.add(MealLog(user_id=user.id, date=start, meal_type=MealType.SNACK))
+    test_db.commit()
+    return logged_in_client
+
+def test_ndjson_export(history_client, stream_sessions):
+    response = history_client.get("/api/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["record"] for row in rows] == ["meal"] * 10 + ["exercise"]
+    assert rows[0]["meal_type"] == "lunch" and rows[0]["food_item"] == "Rice"
+    assert rows[-1]["exercise_name"] == "Run" and rows[-1]["distance"] == 5
+    # Read through a session of its own, closed once the body is sent
+    assert len(stream_sessions) == 1 and stream_sessions[0].closed
+
+def test_csv_export_round_trips_through_import(history_client, test_db):
+    response = history_client.get("/api/export?format=csv&include=meals")
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 10 and {row["record"] for row in rows} == {"meal"}
+
+    response = history_client.post("/api/meals/import", files={"file": ("export.csv", response.text, "text/csv")})
+    assert response.json()["imported_meals"] == 5
+    assert response.json()["failed_rows"] == 0
+
+def test_ndjson_export_round_trips_through_import(history_client, test_db):
+    exported = history_client.get("/api/export?include=meals").text
+    response = history_client.post("/api/meals/import", files={"file": ("export.ndjson", exported, "application/x-ndjson")})
+    assert response.json()["imported_meals"] == 5 and response.json()["failed_rows"] == 0
+    reexported = history_client.get("/api/export?include=meals").text.splitlines()
+    assert len(reexported) == 20
+
+def test_export_rejects_unknown_records(history_client):
+    assert history_client.get("/api/export?include=meals,sleep").status_code == 400
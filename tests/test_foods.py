@@ -0,0 +1,66 @@
+import csv
+import time
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.db.base import FoodItem
+from app.services import foods as food_service
+from app.services.foods import FoodIndex, food_index
+
+SEED = Path(__file__).resolve().parent.parent / "data" / "foods.csv"
+
+
+@pytest.fixture
+def catalog(test_db):
+    food_index.invalidate()
+    with open(SEED, newline="", encoding="utf-8") as f:
+        count = food_service.load_foods(test_db, csv.DictReader(f))
+    yield count
+    food_index.build([])
+    food_index.invalidate()
+
+def test_prefix_index_matches_any_word():
+    index = FoodIndex()
+    index.build([
+        {"id": 1, "name": "Rice, white, cooked"},
+        {"id": 2, "name": "Rice, brown, cooked"},
+        {"id": 3, "name": "Rice cakes"},
+        {"id": 4, "name": "Brownie"},
+    ])
+    assert [f["id"] for f in index.search("rice")] == [3, 2, 1]
+    assert [f["id"] for f in index.search("BROWN")] == [4, 2]
+    assert [f["id"] for f in index.search("rice, br")] == [2]
+    assert index.search("  ") == [] and index.search("xyz") == []
+
+def test_seed_loads_and_searches_fast(test_db, catalog):
+    assert catalog == test_db.query(FoodItem).count() > 50
+    names = [f["name"] for f in food_service.search_foods(test_db, "chick")]
+    assert "Chicken breast, cooked" in names and "Chickpeas, cooked" in names
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        food_index.search("b")
+    assert (time.perf_counter() - started) / 1000 < 0.001
+
+def test_index_reloads_after_catalog_change(test_db, catalog, monkeypatch):
+    assert food_service.search_foods(test_db, "kimchi") == []
+
+    # Loaded through the service: picked up immediately
+    food_service.load_foods(test_db, [{"name": "Kimchi", "category": "vegetable", "calories": 15}])
+    assert [f["name"] for f in food_service.search_foods(test_db, "kim")] == ["Kimchi"]
+
+    # Changed behind the service's back: picked up on the next periodic check
+    test_db.query(FoodItem).filter(FoodItem.name == "Kimchi").delete()
+    test_db.commit()
+    assert food_service.search_foods(test_db, "kim") != []
+    monkeypatch.setattr(settings, "FOOD_CATALOG_RELOAD_SECONDS", 0)
+    assert food_service.search_foods(test_db, "kim") == []
+
+def test_search_endpoint(logged_in_client, catalog):
+    client = logged_in_client
+    response = client.get("/api/foods/search?q=banan")
+    assert response.status_code == 200
+    [banana] = response.json()["items"]
+    assert banana["reference_unit"] == "pcs" and banana["calories"] == 105
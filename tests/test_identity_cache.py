@@ -0,0 +1,59 @@
+import time
+
+from app.core.identity_cache import IdentityCache, UserSnapshot
+from tests.conftest import add_user
+
+
+def make_snapshot(user_id=1, email="test@example.com"):
+    return UserSnapshot(id=user_id, email=email, username=f"user{user_id}")
+
+def test_cache_hit_and_miss_counters():
+    cache = IdentityCache(maxsize=10, ttl=60)
+    assert cache.get("token") is None
+    
+    cache.set("token", make_snapshot())
+    assert cache.get("token").email == "test@example.com"
+    
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+def test_cache_entries_expire():
+    cache = IdentityCache(maxsize=10, ttl=0.01)
+    cache.set("token", make_snapshot())
+    time.sleep(0.02)
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+def test_cache_is_bounded():
+    cache = IdentityCache(maxsize=2, ttl=60)
+    cache.set("a", make_snapshot(1))
+    cache.set("b", make_snapshot(2))
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", make_snapshot(3))
+    
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+def test_invalidate_user_drops_all_tokens():
+    cache = IdentityCache(maxsize=10, ttl=60)
+    cache.set("a", make_snapshot(1))
+    cache.set("b", make_snapshot(1))
+    cache.set("c", make_snapshot(2))
+    
+    cache.invalidate_user(1)
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+def test_deactivation_invalidates_cached_identity(test_db):
+    from app.core.identity_cache import identity_cache
+    user = add_user(test_db)
+
+    identity_cache.set("token", UserSnapshot.from_user(user))
+    user.is_active = False
+    test_db.commit()
+    
+    assert identity_cache.get("token") is None
@@ -0,0 +1,77 @@
+import os
+from datetime import datetime
+
+import jinja2
+import pytest
+
+from app.core import http_cache
+from app.core.http_cache import render_cache
+from app.models.knowledge import KnowledgeCategory, Comment
+
+
+@pytest.fixture
+def category_id(test_db):
+    category = KnowledgeCategory(title="Protein", description="How much?", content="<p>Plenty.</p>")
+    test_db.add(category)
+    test_db.commit()
+    return category.id
+
+def test_category_page_revalidates(logged_in_client, test_db, category_id):
+    client = logged_in_client
+    url = f"/knowledge-base/{category_id}"
+
+    first = client.get(url)
+    assert first.status_code == 200 and "Plenty." in first.text
+    etag = first.headers["ETag"]
+
+    # Current copy: 304 without rendering
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    # Likes and deletions move no timestamp, so the page is validated by ETag alone
+    assert "Last-Modified" not in first.headers
+    assert client.get(url, headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}).status_code == 200
+
+    # Unconditional repeat: served from the render cache
+    hits = render_cache.stats()["hits"]
+    assert client.get(url).text == first.text
+    assert render_cache.stats()["hits"] == hits + 1
+
+    # A new comment, then a like, each change the validator
+    client.post(f"{url}/comments", data={"comment_text": "Great read"}, follow_redirects=False)
+    commented = client.get(url, headers={"If-None-Match": etag})
+    assert commented.status_code == 200 and "Great read" in commented.text
+    comment_id = test_db.query(Comment.id).scalar()
+    client.post(f"/knowledge-base/comments/{comment_id}/like", follow_redirects=False)
+    assert client.get(url, headers={"If-None-Match": commented.headers["ETag"]}).status_code == 200
+
+def test_category_list_revalidates(logged_in_client, test_db, category_id):
+    client = logged_in_client
+    first = client.get("/knowledge-base")
+    assert client.get("/knowledge-base", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    test_db.add(KnowledgeCategory(title="Sleep", description="Why it matters", content="<p>Zz</p>"))
+    test_db.commit()
+    updated = client.get("/knowledge-base", headers={"If-None-Match": first.headers["ETag"]})
+    assert updated.status_code == 200 and "Sleep" in updated.text
+
+def test_template_version_follows_source(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_text("<p>v1</p>")
+    env = jinja2.Environment(loader=jinja2.FileSystemLoader(str(tmp_path)))
+    before = http_cache.template_version(env, "page.html")
+
+    page.write_text("<p>v2</p>")
+    os.utime(page, (page.stat().st_atime, page.stat().st_mtime + 60))
+    http_cache.template_version.cache_clear()
+    after = http_cache.template_version(env, "page.html")
+    assert after[0] != before[0] and after[1] > before[1]
+
+def test_new_markup_invalidates_pages(logged_in_client, category_id, monkeypatch):
+    client = logged_in_client
+    article = client.get(f"/knowledge-base/{category_id}")
+    listing = client.get("/knowledge-base")
+
+    # As after a deploy that changed the templates
+    monkeypatch.setattr(http_cache, "template_version", lambda env, *names: ("redeployed", datetime(2100, 1, 1)))
+    assert client.get(f"/knowledge-base/{category_id}", headers={"If-None-Match": article.headers["ETag"]}).status_code == 200
+    assert client.get("/knowledge-base", headers={"If-None-Match": listing.headers["ETag"]}).status_code == 200
+    assert client.get("/knowledge-base", headers={"If-Modified-Since": listing.headers["Last-Modified"]}).status_code == 200
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.db.base import MealLog, MealComponent, DailyNutritionSummary
+from app.models.meal import MealType
+from app.services import meal_import
+
+
+CSV = """datetime,meal_type,food_item,category,quantity,unit,calories,protein,carbs,fat,notes
+2024-01-01T08:00,breakfast,Oats,carb,50,g,190,6,32,3,first
+2024-01-01T08:00,breakfast,Milk,dairy,200,g,100,7,10,4,
+2024-01-01T12:30,LUNCH,Chicken,protein,150,g,250,45,0,5,
+2024-01-01T13:00,brunch,Toast,carb,1,pcs,80,3,15,1,
+2024-01-02 19:00,dinner,Rice,carb,1,cups,200,4,45,,
+2024-01-02T20:00,snack,Apple,fruit,abc,pcs,95,,,,
+"""
+
+def test_csv_import(logged_in_client, test_db):
+    response = logged_in_client.post(
+        "/api/meals/import", files={"file": ("history.csv", CSV, "text/csv")}
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["imported_meals"] == 3
+    assert report["imported_components"] == 4
+    assert report["failed_rows"] == 2
+    assert [error["line"] for error in report["errors"]] == [5, 7]
+    assert "meal_type" in report["errors"][0]["error"]
+
+    breakfast = test_db.query(MealLog).filter(MealLog.meal_type == MealType.BREAKFAST).one()
+    assert breakfast.notes == "first"
+    assert len(breakfast.components) == 2
+    assert test_db.query(MealComponent).count() == 4
+
+    totals = {row.date.isoformat(): (row.calories, row.meal_count) for row in test_db.query(DailyNutritionSummary)}
+    assert totals == {"2024-01-01": (540, 2), "2024-01-02": (200, 1)}
+
+def test_ndjson_import_in_batches(logged_in_client, test_db, monkeypatch):
+    monkeypatch.setattr(settings, "MEAL_IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "MEAL_IMPORT_MAX_ERRORS", 1)
+    rows = [
+        {"datetime": f"2024-02-{day:02d}T12:00", "meal_type": "lunch", "food_item": "Soup",
+         "category": "vegetable", "quantity": 1, "unit": "servings", "calories": 120}
+        for day in range(1, 6)
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n[1, 2]\n"
+
+    response = logged_in_client.post(
+        "/api/meals/import", files={"file": ("history.ndjson", body, "application/x-ndjson")}
+    )
+    report = response.json()
+    assert report["imported_meals"] == 5
+    assert report["failed_rows"] == 2
+    assert len(report["errors"]) == 1 and report["errors_truncated"]
+    assert test_db.query(DailyNutritionSummary).count() == 5
+
+def test_import_rejects_unknown_format(logged_in_client):
+    response = logged_in_client.post(
+        "/api/meals/import?format=xml", files={"file": ("history.xml", "<meals/>", "text/xml")}
+    )
+    assert response.status_code == 400
+
+def test_unreadable_line_keeps_earlier_batches(logged_in_client, test_db, monkeypatch):
+    monkeypatch.setattr(settings, "MEAL_IMPORT_BATCH_SIZE", 2)
+    header, *rows = CSV.splitlines()
+    body = "\n".join([header, rows[0], rows[1], rows[2], rows[4]]).encode() + b"\n"
+    body += b"2024-01-03T08:00,breakfast,Caf\xe9,drink,1,cups,5,,,,\n" + rows[2].replace("01-01", "01-04").encode() + b"\n"
+
+    response = logged_in_client.post("/api/meals/import", files={"file": ("history.csv", body, "text/csv")})
+    assert response.status_code == 200
+    report = response.json()
+    # Everything before the bad byte is written and reported; nothing after it is read
+    assert report["imported_meals"] == 3 and report["imported_components"] == 4
+    assert report["stopped_after_line"] == 5
+    assert report["errors"][-1]["line"] == 6 and "Could not read file" in report["errors"][-1]["error"]
+    assert test_db.query(MealLog).count() == 3
+
+def test_import_runs_off_the_event_loop(logged_in_client, monkeypatch):
+    seen = []
+    def import_meals(*args):
+        try:
+            asyncio.get_running_loop()
+            seen.append("event loop")
+        except RuntimeError:
+            seen.append("worker thread")
+        return original(*args)
+    original = meal_import.import_meals
+    monkeypatch.setattr(meal_import, "import_meals", import_meals)
+
+    response = logged_in_client.post("/api/meals/import", files={"file": ("history.csv", CSV, "text/csv")})
+    assert response.json()["imported_meals"] == 3
+    assert seen == ["worker thread"]
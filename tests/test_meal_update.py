@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.db.base import MealComponent, DailyNutritionSummary
+from app.models.meal import MealType, FoodCategory, UnitType
+from app.services import meals as meal_service
+
+
+def component(food_item, calories, **extra):
+    return {
+        "food_item": food_item,
+        "category": FoodCategory.CARB,
+        "quantity": 100.0,
+        "unit": UnitType.GRAMS,
+        "calories": calories,
+        "protein": 1.0,
+        "carbs": 20.0,
+        "fat": 0.5,
+        **extra
+    }
+
+def test_update_touches_only_changed_components(test_db, user):
+    meal_date = datetime(2024, 1, 1, 12)
+    meal_id = meal_service.create_meal(
+        test_db, user.id, meal_date, MealType.LUNCH, None,
+        [component("Rice", 130), component("Beans", 120), component("Salsa", 20)]
+    )
+    rice, beans, salsa = [c.id for c in test_db.query(MealComponent).order_by(MealComponent.id)]
+
+    writes = []
+    engine = test_db.get_bind()
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("SELECT"):
+            writes.append(statement.split()[0].upper())
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        # Rice unchanged, beans resized, salsa removed, avocado added
+        changes = meal_service.update_meal(
+            test_db, user.id, meal_id, meal_date, MealType.LUNCH,
+            [component("Rice", 130, id=rice), component("Beans", 180, id=beans), component("Avocado", 160)]
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert changes == {"updated": 1, "inserted": 1, "deleted": 1}
+    # One statement per kind of change plus the rollup upsert; the meal row itself is untouched
+    assert sorted(writes) == ["DELETE", "INSERT", "INSERT", "UPDATE"]
+
+    test_db.expire_all()
+    stored = {c.id: (c.food_item, c.calories) for c in test_db.query(MealComponent)}
+    assert stored[rice] == ("Rice", 130) and stored[beans] == ("Beans", 180)
+    assert salsa not in stored and ("Avocado", 160) in stored.values()
+    assert test_db.query(DailyNutritionSummary).one().calories == 470
+
+    # Nothing changed: nothing written
+    assert meal_service.update_meal(
+        test_db, user.id, meal_id, meal_date, MealType.LUNCH,
+        [{"id": cid, **component(name, cal)} for cid, (name, cal) in stored.items()]
+    ) == {"updated": 0, "inserted": 0, "deleted": 0}
@@ -0,0 +1,50 @@
+import pytest
+
+from app.core import metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = metrics.Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5, route="/a")
+
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 5.55' in lines
+
+def test_requests_keyed_by_route_template(client):
+    before = metrics.http_requests_total.get(method="GET", route="/knowledge-base/{category_id}", status="303")
+    # Not logged in: redirected, but still counted under the route template
+    response = client.get("/knowledge-base/42", follow_redirects=False)
+    assert response.status_code == 303
+    after = metrics.http_requests_total.get(method="GET", route="/knowledge-base/{category_id}", status="303")
+    assert after == before + 1
+
+def test_template_render_time_recorded(client):
+    before = metrics.template_render_seconds.count(template="login.html")
+    client.get("/login")
+    assert metrics.template_render_seconds.count(template="login.html") == before + 1
+    assert metrics.http_request_phase_seconds.count(route="/login", phase="template") >= 1
+
+def test_metrics_endpoint(client):
+    client.get("/login")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'http_requests_total{method="GET",route="/login",status="200"}' in body
+    assert 'identity_cache{stat="hits"}' in body
+    assert 'password_hash_pool{stat="queue_depth"}' in body
+    assert 'http_requests_in_progress{method="GET"} 1' in body
+
+def test_metric_without_samples_rejected_at_construction():
+    class Unfinished(metrics._Metric):
+        kind = "gauge"
+
+    with pytest.raises(TypeError):
+        Unfinished("unfinished", "Never scraped.")
@@ -0,0 +1,54 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.db.base import DailyNutritionSummary
+from app.services import analytics
+from tests.conftest import add_profile
+
+
+@pytest.fixture
+def user_id(user):
+    return user.id
+
+def add_day(db, user_id, day, calories, protein=0.0, carbs=0.0, fat=0.0):
+    db.add(DailyNutritionSummary(
+        user_id=user_id, date=day, calories=calories, protein=protein, carbs=carbs, fat=fat,
+        meal_count=1, updated_at=datetime.utcnow()
+    ))
+
+def test_trends_fill_calendar_and_roll_over_logged_days(test_db, user_id):
+    # Before the range: only counts towards the rolling windows
+    add_day(test_db, user_id, date(2023, 12, 31), 3000)
+    add_day(test_db, user_id, date(2024, 1, 1), 2000, protein=100, carbs=200, fat=40)
+    add_day(test_db, user_id, date(2024, 1, 3), 1000)
+    add_profile(test_db, user_id, daily_calorie_goal=2000, protein_goal=100, carbs_goal=200, fat_goal=60)
+
+    trends = analytics.nutrition_trends(test_db, user_id, date(2024, 1, 1), date(2024, 1, 4))
+
+    assert trends["dates"] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert (trends["start"], trends["end"]) == ("2024-01-01", "2024-01-03")
+    assert trends["logged"] == [True, False, True]
+    assert trends["totals"]["calories"] == [2000, 0, 1000]
+    assert trends["rolling_7"]["calories"] == [2500, 2500, 2000]
+    # 100 g protein and 200 g carbs at 4 kcal/g, 40 g fat at 9 kcal/g
+    assert trends["macro_split"]["protein"][0] == pytest.approx(100 * 400 / 1560, abs=0.01)
+    assert trends["macro_split"]["fat"][1] is None
+
+    assert trends["period"]["logged_days"] == 2
+    assert trends["period"]["averages"]["calories"] == 1500
+    calories = trends["goals"]["adherence"]["calories"]
+    assert calories == {"average_ratio": 0.75, "days_on_target": 1}
+    assert trends["goals"]["ratio"]["calories"] == [1.0, None, 0.5]
+
+def test_trends_without_profile_or_meals(test_db, user_id):
+    trends = analytics.nutrition_trends(test_db, user_id, date(2024, 1, 1), date(2024, 1, 8))
+    assert trends["goals"] is None
+    assert trends["period"]["averages"]["calories"] is None
+    assert trends["rolling_30"]["calories"] == [None] * 7
+
+def test_trends_reject_bad_ranges(test_db, user_id):
+    with pytest.raises(ValueError):
+        analytics.nutrition_trends(test_db, user_id, date(2024, 1, 2), date(2024, 1, 1))
+    with pytest.raises(ValueError):
+        analytics.nutrition_trends(test_db, user_id, date(2000, 1, 1), date(2000, 1, 1) + timedelta(days=analytics.MAX_DAYS + 1))
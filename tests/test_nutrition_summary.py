@@ -0,0 +1,93 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.core.config import settings
+from app.db.base import DailyNutritionSummary
+from app.models.meal import MealType, FoodCategory, UnitType
+from app.services import meals as meal_service
+from app.services import nutrition as nutrition_service
+
+
+def component(calories, protein=0.0, carbs=0.0, fat=0.0):
+    return {
+        "food_item": "Rice",
+        "category": FoodCategory.CARB,
+        "quantity": 100,
+        "unit": UnitType.GRAMS,
+        "calories": calories,
+        "protein": protein,
+        "carbs": carbs,
+        "fat": fat
+    }
+
+@pytest.fixture
+def user_id(user):
+    return user.id
+
+def summary_rows(db, user_id):
+    db.expire_all()
+    return {
+        row.date: (row.calories, row.protein, row.meal_count)
+        for row in db.query(DailyNutritionSummary).filter_by(user_id=user_id)
+    }
+
+def test_meal_writes_maintain_summary(test_db, user_id):
+    jan1, jan2 = date(2024, 1, 1), date(2024, 1, 2)
+    breakfast = meal_service.create_meal(
+        test_db, user_id, datetime(2024, 1, 1, 8), MealType.BREAKFAST, None, [component(300, 10), component(100)]
+    )
+    lunch = meal_service.create_meal(
+        test_db, user_id, datetime(2024, 1, 1, 12), MealType.LUNCH, None, [component(500, 20)]
+    )
+    assert summary_rows(test_db, user_id) == {jan1: (900, 30, 2)}
+
+    # Same day: only the difference is applied
+    meal_service.update_meal(test_db, user_id, lunch, datetime(2024, 1, 1, 13), MealType.LUNCH, [component(600, 25)])
+    assert summary_rows(test_db, user_id) == {jan1: (1000, 35, 2)}
+
+    # Moved to another day: taken off the old day, added to the new one
+    meal_service.update_meal(test_db, user_id, lunch, datetime(2024, 1, 2, 12), MealType.LUNCH, [component(600, 25)])
+    assert summary_rows(test_db, user_id) == {jan1: (400, 10, 1), jan2: (600, 25, 1)}
+
+    # Days left without meals disappear
+    meal_service.delete_meal(test_db, user_id, breakfast)
+    assert summary_rows(test_db, user_id) == {jan2: (600, 25, 1)}
+
+    totals = nutrition_service.get_period_totals(test_db, user_id, jan1, date(2024, 2, 1))
+    assert totals["calories"] == 600 and totals["meal_count"] == 1
+
+def test_rebuild_repairs_drift(test_db, user_id):
+    meal_service.create_meal(test_db, user_id, datetime(2024, 1, 1, 8), MealType.BREAKFAST, None, [component(300, 10)])
+    meal_service.create_meal(test_db, user_id, datetime(2024, 1, 3, 8), MealType.BREAKFAST, None, [])
+    expected = summary_rows(test_db, user_id)
+
+    test_db.query(DailyNutritionSummary).update({"calories": 0})
+    test_db.commit()
+    assert summary_rows(test_db, user_id) != expected
+
+    assert nutrition_service.rebuild_summaries(test_db) == 2
+    assert summary_rows(test_db, user_id) == expected
+
+def test_month_view_query_count_is_flat(logged_in_client, test_db, user_id):
+    client = logged_in_client
+
+    def add_meals(count, day):
+        for hour in range(count):
+            meal_service.create_meal(
+                test_db, user_id, datetime(2024, 1, day, hour), MealType.SNACK, None, [component(100), component(50)]
+            )
+
+    add_meals(2, 1)
+    client.get("/meal-tracker/2024/1")  # warm the identity cache
+    few = client.get("/meal-tracker/2024/1")
+    add_meals(20, 2)
+    many = client.get("/meal-tracker/2024/1?limit=5")
+
+    assert few.status_code == many.status_code == 200
+    assert few.headers["X-DB-Query-Count"] == many.headers["X-DB-Query-Count"]
+    assert "3000 kcal" in many.text
+    # The cut is visible, with a link for the next page of meals
+    assert "Showing 5 of 22 meals this month" in many.text
+    assert f"/meal-tracker/2024/1?limit={5 + settings.MEAL_TRACKER_MEAL_LIMIT}" in many.text
+    assert "Showing" not in client.get("/meal-tracker/2024/1?limit=22").text
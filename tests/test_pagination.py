@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.base import ExerciseLog
+from app.models.exercise import ExerciseType, ExerciseIntensity
+from app.services.pagination import decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def paged_client(logged_in_client, test_db, user):
+    # Two logs per day, the second sharing the first one's timestamp to exercise the id tiebreak
+    start = datetime(2024, 1, 1, 7)
+    for day in range(6):
+        for _ in range(2):
+            test_db.add(ExerciseLog(user_id=user.id, date=start + timedelta(days=day), duration=30,
+                                    exercise_type=ExerciseType.CARDIO, intensity=ExerciseIntensity.LOW))
+    test_db.commit()
+    return logged_in_client
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(datetime(2024, 1, 2, 3, 4), 17)) == (datetime(2024, 1, 2, 3, 4), 17)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+def test_exercise_logs_walk_back_and_forth(paged_client):
+    seen = []
+    pages = []
+    cursor = None
+    while True:
+        url = "/api/exercise-logs?limit=5" + (f"&before={cursor}" if cursor else "")
+        page = paged_client.get(url).json()
+        pages.append(page)
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [len(page["items"]) for page in pages] == [5, 5, 2]
+    assert sorted(seen) == list(range(1, 13)) and len(set(seen)) == 12
+    assert pages[0]["prev_cursor"] is None
+
+    # Walking forward from the last page gives back the middle one
+    back = paged_client.get(f"/api/exercise-logs?limit=5&after={pages[2]['prev_cursor']}").json()
+    assert back["items"] == pages[1]["items"]
+
+def test_exercise_logs_date_range(paged_client):
+    page = paged_client.get("/api/exercise-logs?from=2024-01-02&to=2024-01-03").json()
+    assert {item["date"][:10] for item in page["items"]} == {"2024-01-02", "2024-01-03"}
+    assert len(page["items"]) == 4 and page["next_cursor"] is None
+
+def test_bad_cursor_rejected(paged_client):
+    assert paged_client.get("/api/exercise-logs?before=bogus").status_code == 400
+    assert paged_client.get("/api/meals?before=bogus").status_code == 400
+
+def test_meal_listing_is_paginated(paged_client):
+    page = paged_client.get("/api/meals?limit=5").json()
+    assert page == {"items": [], "next_cursor": None, "prev_cursor": None}
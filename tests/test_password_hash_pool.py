@@ -0,0 +1,35 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.security import PasswordHashPool, get_password_hash, verify_password_async
+
+
+@pytest.mark.asyncio
+async def test_verify_password_runs_on_pool():
+    hashed = get_password_hash("Test123!@#")
+    assert await verify_password_async("Test123!@#", hashed)
+    assert not await verify_password_async("wrong", hashed)
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_with_503():
+    pool = PasswordHashPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+    
+    busy = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    assert pool.stats()["in_flight"] == 1
+    assert pool.stats()["queue_depth"] == 1
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await pool.run(release.wait)
+    assert exc_info.value.status_code == 503
+    
+    release.set()
+    await asyncio.gather(*busy)
+    stats = pool.stats()
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert stats["queue_depth"] == 0
@@ -0,0 +1,83 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.base import Base, KnowledgeCategory, Comment
+from app.db.instrumentation import track_request_db
+from app.services import knowledge as knowledge_service
+from tests.conftest import add_user
+
+
+def add_comments(db, count):
+    category = KnowledgeCategory(title="Protein", description="Protein", content="<p>protein</p>")
+    db.add(category)
+    db.flush()
+    for i in range(count):
+        # A separate author per comment so every lazy load hits the database
+        author = add_user(db, email=f"author{i}@example.com", username=f"author{i}")
+        db.add(Comment(category_id=category.id, user_id=author.id, content=f"comment {i}"))
+    category_id = category.id
+    db.commit()
+    db.expunge_all()
+    return category_id
+
+def test_lazy_loads_flagged_as_repeated(test_db):
+    category_id = add_comments(test_db, 6)
+
+    with track_request_db(track_statements=True) as stats:
+        category = test_db.get(KnowledgeCategory, category_id)
+        authors = [comment.user.username for comment in category.comments]
+    assert len(authors) == 6
+    assert stats.queries == 8
+    assert stats.db_time > 0
+    [(statement, count)] = stats.repeated_statements(5)
+    assert count == 6 and "FROM users" in statement
+
+    test_db.expunge_all()
+    with track_request_db(track_statements=True) as stats:
+        page = knowledge_service.get_comment_page(test_db, category_id, 10)
+        authors = [comment.user.username for comment in page["items"]]
+    assert len(authors) == 6
+    assert stats.queries == 1
+    assert stats.repeated_statements(2) == []
+
+def test_failing_statements_counted(test_db):
+    with track_request_db(track_statements=True) as stats:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                test_db.execute(text("SELECT * FROM missing_table"))
+            test_db.rollback()
+        test_db.execute(text("SELECT 1"))
+    assert stats.queries == 4 and stats.db_time > 0
+    assert stats.statements["SELECT * FROM missing_table"] == 3
+    assert not [key for key in test_db.connection().info if key.startswith("request_query")]
+
+def test_query_headers(client):
+    response = client.get("/login")
+    assert response.headers["X-DB-Query-Count"] == "0"
+    assert float(response.headers["X-DB-Time-ms"]) == 0
+    assert "X-DB-N-Plus-One" not in response.headers
+
+def test_n_plus_one_header_in_debug_mode(client, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "DB_N_PLUS_ONE_DETECTION", True)
+    with caplog.at_level(logging.WARNING, logger="app.main"):
+        response = client.get("/login")
+    assert response.headers["X-DB-N-Plus-One"] == "0"
+    assert not caplog.records
+
+@pytest.mark.asyncio
+async def test_queries_counted_on_async_engine():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine)() as db:
+        with track_request_db() as stats:
+            await db.run_sync(knowledge_service.get_categories)
+    await engine.dispose()
+    assert stats.queries == 1
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.models.meal import MealType, FoodCategory, UnitType
+from app.services import meals as meal_service
+from app.services import exercises as exercise_service
+from app.services.pagination import encode_cursor
+
+
+@pytest.fixture
+def captured_statements(test_db):
+    """Record every SELECT the session issues while the test runs."""
+    statements = []
+    engine = test_db.get_bind()
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+    
+    event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", capture)
+
+@pytest.fixture
+def user_with_meal(test_db, user):
+    meal_service.create_meal(
+        test_db, user.id, datetime(2024, 1, 15, 12, 0), MealType.LUNCH, None,
+        [{"food_item": "Rice", "category": FoodCategory.CARB, "quantity": 100,
+          "unit": UnitType.GRAMS, "calories": 130, "protein": 2.7, "carbs": 28, "fat": 0.3}]
+    )
+    return user.id
+
+def query_plan(test_db, statement, parameters):
+    connection = test_db.connection()
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[3] for row in rows]
+
+def assert_uses_indexes(test_db, statements, tables):
+    assert statements
+    for statement, parameters in statements:
+        plan = query_plan(test_db, statement, parameters)
+        for table in tables:
+            assert not any(step == f"SCAN {table}" for step in plan), (statement, plan)
+        assert any("USING" in step for step in plan), (statement, plan)
+
+def test_month_view_uses_indexes(test_db, user_with_meal, captured_statements):
+    meal_service.get_meals_between(
+        test_db, user_with_meal, datetime(2024, 1, 1), datetime(2024, 2, 1), descending=True
+    )
+    assert_uses_indexes(test_db, captured_statements, ["meal_logs", "meal_components"])
+
+def test_day_view_uses_indexes(test_db, user_with_meal, captured_statements):
+    meal_service.get_meals_between(test_db, user_with_meal, datetime(2024, 1, 15), datetime(2024, 1, 16))
+    assert_uses_indexes(test_db, captured_statements, ["meal_logs", "meal_components"])
+
+def test_exercise_list_uses_index(test_db, user_with_meal, captured_statements):
+    page = exercise_service.get_exercise_log_page(test_db, user_with_meal, 10)
+    exercise_service.get_exercise_log_page(
+        test_db, user_with_meal, 10, before=encode_cursor(datetime(2024, 1, 15), 1)
+    )
+    assert page["next_cursor"] is None
+    assert_uses_indexes(test_db, captured_statements, ["exercise_logs"])
@@ -0,0 +1,22 @@
+import pytest
+from fastapi import Request
+
+from app.main import login_required
+
+
+def test_protected_route_uses_single_checkout(logged_in_client):
+    # First hit resolves the user on the route's own session
+    response = logged_in_client.get("/dashboard")
+    assert response.status_code == 200
+    assert response.headers["X-DB-Checkouts"] == "1"
+    
+    # Cached identity: the dashboard itself needs no connection at all
+    response = logged_in_client.get("/dashboard")
+    assert response.status_code == 200
+    assert response.headers["X-DB-Checkouts"] == "0"
+
+def test_login_required_demands_db_dependency():
+    with pytest.raises(TypeError):
+        @login_required
+        async def no_db_route(request: Request):
+            pass
@@ -0,0 +1,28 @@
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.db.sqlite import apply_sqlite_profile
+
+
+def test_profile_applied_on_connect(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    apply_sqlite_profile(engine)
+    
+    with engine.connect() as conn:
+        pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("foreign_keys") == 0  # opt-in
+        assert pragma("busy_timeout") == 5000
+        assert pragma("temp_store") == 2  # MEMORY
+        assert pragma("cache_size") == -64000
+        assert pragma("mmap_size") == 256 * 1024 * 1024
+    engine.dispose()
+
+def test_foreign_keys_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SQLITE_FOREIGN_KEYS", True)
+    engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    apply_sqlite_profile(engine)
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+    engine.dispose()
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from app.core.enums import Gender, FitnessGoal
+from app.db.base import UserProfile
+from app.services import targets
+from tests.conftest import add_user, add_profile
+
+
+def test_targets_match_survey_form():
+    # Worked through survey_calculations.js: BMR 1648.75 * 1.55 = 2555.5625
+    assert targets.nutrition_targets(70.0, 175.0, 30, Gender.MALE, FitnessGoal.MUSCLE_GAIN) == targets.Targets(
+        daily_calorie_goal=2556, protein_goal=192, carbs_goal=320, fat_goal=57, water_goal=2.8
+    )
+    assert targets.calculate_bmi(70.0, 175.0) == 22.9
+    # Halves round up, as Math.round does
+    assert targets.calculate_macros(10, FitnessGoal.GENERAL_HEALTH)["protein"] == 1
+    with pytest.raises(ValueError):
+        targets.calculate_tdee(70.0, 175.0, 30, Gender.MALE, "couch")
+
+def test_vectorized_targets_match_scalar():
+    rng = np.random.default_rng(0)
+    count = 200
+    weight = rng.uniform(40, 150, count).round(1)
+    height = rng.uniform(140, 210, count).round(1)
+    age = rng.integers(18, 90, count)
+    genders = [[Gender.MALE, Gender.FEMALE][i] for i in rng.integers(0, 2, count)]
+    goals = [list(FitnessGoal)[i] for i in rng.integers(0, len(FitnessGoal), count)]
+
+    ratios = np.array([targets.MACRO_RATIOS[targets.GOAL_RATIOS[goal]] for goal in goals])
+    batch = targets.targets_for_arrays(weight, height, age, np.array([g == Gender.MALE for g in genders]), ratios, "very_active")
+    for i in range(count):
+        expected = targets.nutrition_targets(
+            float(weight[i]), float(height[i]), int(age[i]), genders[i], goals[i], "very_active"
+        )
+        assert tuple(batch[name][i] for name in targets.Targets._fields) == expected
+
+def test_recompute_profile_targets(test_db):
+    for n, (gender, goal) in enumerate([(Gender.MALE, FitnessGoal.MUSCLE_GAIN), (Gender.FEMALE, FitnessGoal.WEIGHT_LOSS)]):
+        user = add_user(test_db, email=f"user{n}@example.com", username=f"user{n}")
+        add_profile(
+            test_db, user.id, gender=gender, height=175, weight=70, fitness_goal=goal,
+            daily_calorie_goal=1500, protein_goal=1, carbs_goal=1, fat_goal=1, water_goal=1.0
+        )
+
+    assert targets.recompute_profile_targets(test_db, chunk_size=1) == 2
+    test_db.expire_all()
+    for profile in test_db.query(UserProfile):
+        expected = targets.nutrition_targets(70.0, 175.0, 30, profile.gender, profile.fitness_goal)
+        assert tuple(getattr(profile, name) for name in targets.Targets._fields) == expected
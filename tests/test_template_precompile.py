@@ -0,0 +1,27 @@
+import jinja2
+
+from app.core import metrics
+from app.main import templates
+
+
+def make_templates(cache):
+    instance = metrics.TimedJinja2Templates(directory="templates", bytecode_cache=cache)
+    instance.env.filters.update(templates.env.filters)
+    return instance
+
+def test_precompile_loads_every_template(tmp_path):
+    cache = jinja2.FileSystemBytecodeCache(str(tmp_path))
+    cold = make_templates(cache)
+    report = cold.precompile()
+    assert set(report) == set(cold.env.list_templates()) and "dashboard.html" in report
+    written = {path.name: path.stat().st_mtime_ns for path in tmp_path.iterdir()}
+    assert len(written) == len(report)
+
+    # Another worker reuses the compiled code instead of writing it again
+    warm = make_templates(cache)
+    assert set(warm.precompile()) == set(report)
+    assert {path.name: path.stat().st_mtime_ns for path in tmp_path.iterdir()} == written
+
+def test_startup_precompiles_templates(client):
+    assert all(metrics.template_compile_seconds.get(template=name) > 0 for name in templates.env.list_templates())
+    assert 'template_compile_seconds{template="login.html"}' in client.get("/metrics").text
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.db.base import MealComponent
+from app.models.meal import MealType, FoodCategory, UnitType
+from app.services import meals as meal_service
+from app.services.units import OUNCE_GRAMS, to_grams, backfill_quantity_grams
+
+
+def test_to_grams_converts_each_unit():
+    grams = to_grams(
+        [150, 2, 1, 2, 1, 3],
+        [UnitType.GRAMS, "oz", UnitType.CUPS, UnitType.PIECES, UnitType.SERVINGS, UnitType.PIECES],
+        [FoodCategory.CARB, FoodCategory.PROTEIN, FoodCategory.DAIRY, FoodCategory.PROTEIN, FoodCategory.FAT, FoodCategory.OTHER],
+        ["Rice", "Chicken", "Milk, whole (organic)", "Egg", "Olive oil", "Mystery snack"]
+    )
+    assert grams == pytest.approx([150, 2 * OUNCE_GRAMS, 244, 100, 13.5, 90])
+
+def test_to_grams_falls_back_to_category_and_flags_unknown_units():
+    # No "bread sourdough" entry: the "bread" prefix applies, and its missing cup weight comes from the category
+    grams = to_grams([1, 1, 1], ["pcs", "cups", "handful"], ["carb", "carb", "carb"], ["Bread, sourdough", "Bread", "Bread"])
+    assert grams[:2] == pytest.approx([28, 158])
+    assert np.isnan(grams[2])
+
+def test_writes_and_backfill_fill_quantity_grams(test_db, user):
+    meal_id = meal_service.create_meal(
+        test_db, user.id, datetime(2024, 1, 1, 8), MealType.BREAKFAST, None,
+        [{"food_item": "Banana", "category": FoodCategory.FRUIT, "quantity": 2, "unit": UnitType.PIECES, "calories": 210}]
+    )
+    component = test_db.query(MealComponent).one()
+    assert component.quantity_grams == pytest.approx(236)
+
+    meal_service.update_meal(
+        test_db, user.id, meal_id, datetime(2024, 1, 1, 8), MealType.BREAKFAST,
+        [{"id": component.id, "food_item": "Banana", "category": FoodCategory.FRUIT, "quantity": 1,
+          "unit": UnitType.PIECES, "calories": 105}]
+    )
+    test_db.expire_all()
+    assert test_db.query(MealComponent).one().quantity_grams == pytest.approx(118)
+
+    # Rows written before the column existed
+    test_db.query(MealComponent).update({"quantity_grams": None})
+    test_db.commit()
+    assert backfill_quantity_grams(test_db, batch_size=1) == 1
+    test_db.expire_all()
+    assert test_db.query(MealComponent).one().quantity_grams == pytest.approx(118)
+    assert backfill_quantity_grams(test_db) == 0